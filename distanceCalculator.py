@@ -0,0 +1,279 @@
+# distanceCalculator.py
+# ---------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Precomputed maze distances between every pair of open cells of a layout.
+
+The table is a flat array of unsigned 16-bit distances, one row per open
+cell of gridGraph.GridGraph, computed with one breadth-first search per cell.  It is saved under
+CACHE_DIR in a file named after a hash of the walls, so later processes map it
+into memory instead of recomputing it.  Use getDistanceTable(walls) and then
+table.getDistance(point1, point2).
+
+Layouts too big for a table of all pairs can use getLandmarkTable(walls)
+instead, which keeps the distances from a few landmark cells only and
+answers getDistance with a lower bound (ALT).
+"""
+
+import array
+import collections
+import hashlib
+import mmap
+import os
+import sys
+import tempfile
+
+import gridGraph
+
+# Where distance tables are saved; None keeps them in memory only
+CACHE_DIR = os.path.join(tempfile.gettempdir(), 'pacman-distances')
+
+# Table entry for cells that cannot reach each other
+UNREACHABLE = 0xFFFF
+
+_tables = collections.OrderedDict()  # walls hash -> ((), DistanceTable), for this process
+_tablesById = collections.OrderedDict()  # id(walls) -> ((walls,), DistanceTable), so known walls are not rehashed
+_landmarks = collections.OrderedDict()  # (id(walls), count) -> ((walls,), LandmarkTable)
+
+# Landmarks a LandmarkTable keeps distances from
+LANDMARK_COUNT = 8
+
+
+def wallsKey(walls):
+    """
+    A hash of the wall layout (and of the byte order the table is saved in).
+    """
+    digest = hashlib.sha1(('%d %d %s ' % (walls.width, walls.height, sys.byteorder)).encode())
+    for x in range(walls.width):
+        digest.update(bytes(bool(walls[x][y]) for y in range(walls.height)))
+    return digest.hexdigest()
+
+
+class DistanceTable:
+    """
+    All-pairs maze distances over the open cells of one wall layout.
+    """
+
+    def __init__(self, walls, cacheDir=CACHE_DIR, key=None):
+        self.walls = walls
+        self.key = key or wallsKey(walls)
+        self.graph = gridGraph.getGridGraph(walls)
+        self.index = self.graph.index
+        self.size = self.graph.size
+        self.distances = None
+        path = None
+        if cacheDir is not None and self.size:
+            path = os.path.join(cacheDir, self.key + '.dist')
+            self.distances = self._load(path)
+        if self.distances is None:
+            self.distances = self._compute()
+            if path is not None:
+                self._save(path)
+
+    def getDistance(self, point1, point2):
+        """
+        The maze distance between two open cells, or float('inf') if one
+        cannot be reached from the other.
+        """
+        distance = self.distances[self.index[point1] * self.size + self.index[point2]]
+        if distance == UNREACHABLE:
+            return float('inf')
+        return distance
+
+    def getPath(self, point1, point2):
+        """
+        The actions of a shortest path from point1 to point2, found by
+        stepping to a neighbour one closer each time, or None if point2
+        cannot be reached.
+        """
+        if self.getDistance(point1, point2) == float('inf'):
+            return None
+        graph, distances, size = self.graph, self.distances, self.size
+        cell, goal = self.index[point1], self.index[point2]
+        actions = []
+        while cell != goal:
+            closer = distances[cell * size + goal] - 1
+            for neighbor, action in graph.getMoves(cell):
+                if distances[neighbor * size + goal] == closer:
+                    cell = neighbor
+                    actions.append(action)
+                    break
+        return actions
+
+    def _compute(self):
+        size, offsets, targets = self.size, self.graph.offsets, self.graph.targets
+        neighbors = [targets[offsets[cell]:offsets[cell + 1]] for cell in range(size)]
+        distances = array.array('H', [UNREACHABLE]) * (size * size)
+        for source in range(size):
+            row = source * size
+            distances[row + source] = 0
+            fringe = collections.deque([source])
+            while fringe:
+                cell = fringe.popleft()
+                distance = distances[row + cell] + 1
+                for neighbor in neighbors[cell]:
+                    if distances[row + neighbor] == UNREACHABLE:
+                        distances[row + neighbor] = distance
+                        fringe.append(neighbor)
+        return distances
+
+    def _load(self, path):
+        try:
+            with open(path, 'rb') as tableFile:
+                if os.fstat(tableFile.fileno()).st_size != 2 * self.size * self.size:
+                    return None
+                # The mapping stays valid after the file is closed
+                return memoryview(mmap.mmap(tableFile.fileno(), 0, access=mmap.ACCESS_READ)).cast('H')
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, path):
+        # Write to a private file first so readers never see half a table
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            partial = '%s.%d' % (path, os.getpid())
+            with open(partial, 'wb') as tableFile:
+                self.distances.tofile(tableFile)
+            os.replace(partial, path)
+        except OSError:
+            pass
+
+
+def getDistanceTable(walls, cacheDir=CACHE_DIR):
+    """
+    The DistanceTable for these walls, built, loaded from disk or reused from
+    an earlier call in this process.
+    """
+    def build():
+        key = wallsKey(walls)
+        return gridGraph.getCached(_tables, key, (), lambda: DistanceTable(walls, cacheDir, key))
+    return gridGraph.getCached(_tablesById, id(walls), (walls,), build)
+
+
+def breadthFirstDistances(graph, source):
+    """
+    The distances from cell number source to every cell of a
+    gridGraph.GridGraph, UNREACHABLE where there is no path.
+    """
+    offsets, targets = graph.offsets, graph.targets
+    distances = array.array('H', [UNREACHABLE]) * graph.size
+    distances[source] = 0
+    fringe = collections.deque([source])
+    while fringe:
+        cell = fringe.popleft()
+        distance = distances[cell] + 1
+        for neighbor in targets[offsets[cell]:offsets[cell + 1]]:
+            if distances[neighbor] == UNREACHABLE:
+                distances[neighbor] = distance
+                fringe.append(neighbor)
+    return distances
+
+
+def descendPath(graph, distances, cell):
+    """
+    The actions of a shortest path from cell number 'cell' to the source of
+    distances (from breadthFirstDistances on the same graph), found by
+    stepping to a neighbour one closer each time, or None if the source
+    cannot be reached.
+    """
+    if distances[cell] == UNREACHABLE:
+        return None
+    actions = []
+    while distances[cell]:
+        closer = distances[cell] - 1
+        for neighbor, action in graph.getMoves(cell):
+            if distances[neighbor] == closer:
+                cell = neighbor
+                actions.append(action)
+                break
+    return actions
+
+
+def heldKarpWalks(between):
+    """
+    The shortest walks through a few points, by dynamic programming over
+    subsets of them (Held-Karp).  Given the distances between[i][j] between
+    the points (float('inf') where there is no path), walks[i][mask] is the
+    length of the shortest walk that starts at point i and visits every
+    point in the bitmask mask, where bit i is clear.  Takes time O(2^n n^2)
+    for n points.
+    """
+    size = len(between)
+    walks = [[0] * (1 << size) for _ in range(size)]
+    for mask in range(1, 1 << size):
+        for i in range(size):
+            if not mask >> i & 1:
+                walks[i][mask] = min(between[i][j] + walks[j][mask ^ 1 << j] for j in range(size) if mask >> j & 1)
+    return walks
+
+
+class LandmarkTable:
+    """
+    Maze distances from a few landmark cells, chosen by farthest-point
+    selection in the largest connected part of the layout: each new landmark
+    is the cell there farthest from those chosen so far.  By the triangle
+    inequality the distance between two cells is at least |d(L, a) - d(L, b)|
+    for every landmark L, and getDistance returns the largest of those bounds
+    and the Manhattan distance (the ALT bound).  Memory is linear in the
+    number of cells.
+    """
+
+    def __init__(self, walls, count=LANDMARK_COUNT):
+        self.graph = gridGraph.getGridGraph(walls)
+        self.index = self.graph.index
+        self.landmarks, self.distances = [], []
+        if not self.graph.size:
+            return
+        # Landmarks elsewhere would tell nothing about the largest part
+        seen, part = bytearray(self.graph.size), []
+        for cell in range(self.graph.size):
+            if not seen[cell]:
+                reached = breadthFirstDistances(self.graph, cell)
+                candidate = [other for other in range(self.graph.size) if reached[other] != UNREACHABLE]
+                for other in candidate:
+                    seen[other] = 1
+                if len(candidate) > len(part):
+                    part, nearest = candidate, reached
+        # Start from the cell farthest from an arbitrary one
+        for _ in range(min(count, len(part))):
+            landmark = max(part, key=nearest.__getitem__)
+            distances = breadthFirstDistances(self.graph, landmark)
+            if not self.landmarks:
+                nearest = distances
+            else:
+                nearest = array.array('H', map(min, nearest, distances))
+            self.landmarks.append(self.graph.cells[landmark])
+            self.distances.append(distances)
+
+    def getDistance(self, point1, point2):
+        """
+        A lower bound on the maze distance between two open cells, or
+        float('inf') if they cannot reach each other.
+        """
+        cell1, cell2 = self.index[point1], self.index[point2]
+        bound = abs(point1[0] - point2[0]) + abs(point1[1] - point2[1])
+        for distances in self.distances:
+            distance1, distance2 = distances[cell1], distances[cell2]
+            if (distance1 == UNREACHABLE) != (distance2 == UNREACHABLE):
+                return float('inf')
+            if distance1 != UNREACHABLE and abs(distance1 - distance2) > bound:
+                bound = abs(distance1 - distance2)
+        return bound
+
+
+def getLandmarkTable(walls, count=LANDMARK_COUNT):
+    """
+    The LandmarkTable of these walls, built on first use in this process.
+    """
+    return gridGraph.getCached(_landmarks, (id(walls), count), (walls,), lambda: LandmarkTable(walls, count))
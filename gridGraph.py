@@ -0,0 +1,148 @@
+# gridGraph.py
+# ------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+The open cells of a layout as a compact graph.
+
+Cells are numbered 0..n-1 column by column, and the moves out of cell i are
+targets[offsets[i]:offsets[i + 1]] with the matching entries of actions, in
+the order north, south, east, west that the search problems use.  Search
+problems built with compact=True use these cell numbers as states.
+
+JunctionGraph contracts the corridors of a layout into single edges, for
+search problems built with contract=True.
+"""
+
+import array
+import collections
+
+from game import Directions
+
+# The moves tried from every cell, in order, with the step they make
+MOVES = ((Directions.NORTH, 0, 1), (Directions.SOUTH, 0, -1), (Directions.EAST, 1, 0), (Directions.WEST, -1, 0))
+
+# Layouts a per-layout cache (see getCached) keeps, least recently used first out
+LAYOUT_CACHE_SIZE = 8
+
+_graphs = collections.OrderedDict()  # id(walls) -> ((walls,), GridGraph)
+_costs = collections.OrderedDict()  # (id(walls), id(costFn)) -> ((walls, costFn), costs)
+
+
+class GridGraph:
+    """
+    Open cells numbered as dense integers, with CSR neighbour and action
+    arrays.  cells[i] is the (x, y) position of cell i and index the reverse
+    mapping.
+    """
+
+    def __init__(self, walls):
+        self.walls = walls
+        self.cells = [(x, y) for x in range(walls.width) for y in range(walls.height) if not walls[x][y]]
+        self.index = dict((cell, i) for i, cell in enumerate(self.cells))
+        self.size = len(self.cells)
+        self.offsets = array.array('l', [0])
+        self.targets = array.array('l')
+        self.actions = []
+        for x, y in self.cells:
+            for action, dx, dy in MOVES:
+                neighbor = self.index.get((x + dx, y + dy))
+                if neighbor is not None:
+                    self.targets.append(neighbor)
+                    self.actions.append(action)
+            self.offsets.append(len(self.targets))
+
+    def getMoves(self, cell):
+        """
+        The (neighbour, action) pairs out of a cell number.
+        """
+        start, end = self.offsets[cell], self.offsets[cell + 1]
+        return zip(self.targets[start:end], self.actions[start:end])
+
+
+def getCached(cache, key, owners, build, size=LAYOUT_CACHE_SIZE):
+    """
+    The value stored in an OrderedDict cache under key, or build() stored
+    there instead.  key holds the id() of each object in owners; the entry
+    keeps those objects alive and is only used while they are the very same
+    objects.  At most size entries are kept, least recently used first out.
+    """
+    entry = cache.get(key)
+    if entry is not None and all(known is owner for known, owner in zip(entry[0], owners)):
+        cache.move_to_end(key)
+        return entry[1]
+    value = build()
+    cache[key] = (owners, value)
+    cache.move_to_end(key)
+    if len(cache) > size:
+        cache.popitem(last=False)
+    return value
+
+
+def getGridGraph(walls):
+    """
+    The GridGraph of these walls, shared by every problem on the same layout.
+    """
+    return getCached(_graphs, id(walls), (walls,), lambda: GridGraph(walls))
+
+
+def getCostArray(walls, costFn):
+    """
+    costFn(position) for every open cell, as an array('d') indexed by the
+    cell numbers of getGridGraph(walls).  Search problems look step costs up
+    here instead of calling costFn on every move; the array is computed once
+    per walls and costFn.
+    """
+    return getCached(_costs, (id(walls), id(costFn)), (walls, costFn),
+                     lambda: array.array('d', map(costFn, getGridGraph(walls).cells)))
+
+
+class JunctionGraph:
+    """
+    The layout with its corridors contracted: the nodes are the junctions,
+    the dead ends and any cells listed in 'keep' (say the start and the
+    goals), and each edge is a whole corridor between two nodes.  edges[p]
+    lists (q, actions, cost) for the nodes q one corridor away from node p,
+    where actions is the tuple of primitive moves along the corridor and
+    cost is the sum of costs[cell] over the cells entered, where costs is
+    indexed by cell number (see getCostArray), or their number if costs is
+    None.
+
+    A corridor cell has exactly two open neighbours, so a path that enters a
+    corridor and does not stop inside it (nothing in it is kept) leaves by
+    the other end.  The shortest paths between nodes are therefore the
+    same as in the grid.
+    """
+
+    def __init__(self, walls, keep=(), costs=None):
+        graph = getGridGraph(walls)
+        offsets, cells = graph.offsets, graph.cells
+        kept = set(graph.index[position] for position in keep if position in graph.index)
+        isNode = [offsets[cell + 1] - offsets[cell] != 2 or cell in kept for cell in range(graph.size)]
+        self.edges = {}
+        for node in range(graph.size):
+            if not isNode[node]:
+                continue
+            edges = self.edges[cells[node]] = []
+            for cell, action in graph.getMoves(node):
+                previous, actions = node, [action]
+                cost = costs[cell] if costs is not None else 1
+                while not isNode[cell]:
+                    for following, move in graph.getMoves(cell):
+                        if following != previous:
+                            break
+                    previous, cell = cell, following
+                    actions.append(move)
+                    cost += costs[cell] if costs is not None else 1
+                if cell != node:
+                    edges.append((cells[cell], tuple(actions), cost))
@@ -0,0 +1,233 @@
+# patternDatabase.py
+# ------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Pattern databases for the FoodSearchProblem, built ahead of time per layout.
+
+The food of a layout is split into patterns of at most PATTERN_SIZE nearby
+dots.  For each pattern the database holds, for every open cell and every
+subset of the pattern's dots, the exact maze-distance cost of eating that
+subset starting from that cell.  Every pattern value is a lower bound on
+the cost of eating all the food, and so is their maximum, which is what
+getValue returns.  (Adding them up would overcount: one move can serve
+several patterns.)
+
+Databases are saved under DATABASE_DIR, one file per walls and food
+placement, and foodHeuristic loads them on first use.  Build them with
+
+  python patternDatabase.py                  (every layout in layouts/)
+  python patternDatabase.py -l trickySearch  (some layouts)
+"""
+
+import array
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from optparse import OptionParser
+
+import distanceCalculator
+import gridGraph
+
+# Dots per pattern: tables hold one entry per open cell per subset of them
+PATTERN_SIZE = 8
+
+# Where databases are saved and looked for
+DATABASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'patterns')
+
+MAGIC = b'PDB1'
+
+
+class PatternDatabase:
+    """
+    Exact costs of eating subsets of food patterns, for every open cell.
+
+    tables[i][cell << len(patterns[i]) | mask] is the cost for pattern i,
+    where cell is a gridGraph cell number and bit j of mask stands for the
+    dot patterns[i][j].
+    """
+
+    def __init__(self, walls, patterns, tables):
+        self.graph = gridGraph.getGridGraph(walls)
+        self.patterns = patterns
+        self.tables = tables
+
+    def getMasks(self, foodList):
+        """
+        The subset of each pattern among the given food, as bitmasks.
+        """
+        food = set(foodList)
+        masks = []
+        for pattern in self.patterns:
+            mask = 0
+            for bit, dot in enumerate(pattern):
+                if dot in food:
+                    mask |= 1 << bit
+            masks.append(mask)
+        return masks
+
+    def getValue(self, position, masks):
+        """
+        A lower bound on the cost of eating the food from position, given
+        the masks getMasks returned for that food.
+        """
+        cell = self.graph.index[position]
+        value = 0
+        for pattern, table, mask in zip(self.patterns, self.tables, masks):
+            if mask:
+                value = max(value, table[cell << len(pattern) | mask])
+        return value
+
+    def save(self, path):
+        # Header: magic, header length, JSON header padded to an even size
+        header = json.dumps({'patterns': self.patterns, 'cells': self.graph.size}).encode()
+        header += b' ' * (len(header) % 2)
+        partial = '%s.%d' % (path, os.getpid())
+        with open(partial, 'wb') as databaseFile:
+            databaseFile.write(MAGIC + struct.pack('<I', len(header)) + header)
+            for table in self.tables:
+                table.tofile(databaseFile)
+        os.replace(partial, path)
+
+
+def databaseKey(walls, foodList):
+    """
+    A hash of the walls and the food placement a database was built for.
+    """
+    digest = hashlib.sha1(distanceCalculator.wallsKey(walls).encode())
+    digest.update(repr(sorted(foodList)).encode())
+    return digest.hexdigest()
+
+
+def databasePath(walls, foodList, directory=DATABASE_DIR):
+    return os.path.join(directory, databaseKey(walls, foodList) + '.pdb')
+
+
+def choosePatterns(foodList, distances, patternSize=PATTERN_SIZE):
+    """
+    Splits the food into groups of at most patternSize dots, each one a dot
+    and the dots nearest to it that are not grouped yet.
+    """
+    remaining = sorted(foodList)
+    patterns = []
+    while remaining:
+        seed = remaining[0]
+        remaining.sort(key=lambda dot: distances.getDistance(seed, dot))
+        patterns.append(remaining[:patternSize])
+        remaining = sorted(remaining[patternSize:])
+    return patterns
+
+
+def buildTable(pattern, graph, distances):
+    """
+    The table of one pattern: for every cell and subset of the pattern, the
+    cheapest walk from the cell through every dot of the subset.
+    """
+    size = len(pattern)
+    full = 1 << size
+    between = [[distances.getDistance(dot, other) for other in pattern] for dot in pattern]
+
+    # tour[i][mask]: cheapest walk from dot i through the dots in mask
+    tour = distanceCalculator.heldKarpWalks(between)
+
+    table = array.array('H', [0]) * (graph.size * full)
+    for cell, position in enumerate(graph.cells):
+        toDots = [distances.getDistance(position, dot) for dot in pattern]
+        row = cell * full
+        for mask in range(1, full):
+            cost = min(toDots[j] + tour[j][mask ^ 1 << j] for j in range(size) if mask >> j & 1)
+            table[row + mask] = min(cost, distanceCalculator.UNREACHABLE)
+    return table
+
+
+def buildPatternDatabase(walls, foodList, patternSize=PATTERN_SIZE):
+    """
+    Builds the PatternDatabase of a layout and its food placement.
+    """
+    distances = distanceCalculator.getDistanceTable(walls)
+    graph = gridGraph.getGridGraph(walls)
+    patterns = choosePatterns(foodList, distances, patternSize)
+    tables = [buildTable(pattern, graph, distances) for pattern in patterns]
+    return PatternDatabase(walls, patterns, tables)
+
+
+def loadPatternDatabase(walls, foodList, directory=DATABASE_DIR):
+    """
+    Maps the saved PatternDatabase for these walls and food into memory, or
+    returns None if none was built.
+    """
+    try:
+        with open(databasePath(walls, foodList, directory), 'rb') as databaseFile:
+            data = mmap.mmap(databaseFile.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if data[:4] != MAGIC:
+        return None
+    headerSize, = struct.unpack('<I', data[4:8])
+    header = json.loads(data[8:8 + headerSize].decode())
+    patterns = [[tuple(dot) for dot in pattern] for pattern in header['patterns']]
+    entries = memoryview(data)[8 + headerSize:].cast('H')
+    tables, offset = [], 0
+    for pattern in patterns:
+        size = header['cells'] << len(pattern)
+        tables.append(entries[offset:offset + size])
+        offset += size
+    return PatternDatabase(walls, patterns, tables)
+
+
+def readCommand(argv):
+    usageStr = """
+    USAGE:      python patternDatabase.py <options>
+    EXAMPLES:   (1) python patternDatabase.py
+                    - builds databases for every layout in layouts/
+                (2) python patternDatabase.py -l trickySearch -s 6
+    """
+    parser = OptionParser(usageStr)
+    parser.add_option('-l', '--layout', dest='layouts', action='append', metavar='LAYOUT_FILE',
+                      help='a layout to build a database for (repeatable; default: all layouts)')
+    parser.add_option('-s', '--patternSize', dest='patternSize', type='int', default=PATTERN_SIZE,
+                      help='most dots per pattern [Default: %default]')
+    parser.add_option('-d', '--directory', dest='directory', default=DATABASE_DIR,
+                      help='where to save the databases [Default: %default]')
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+    return options
+
+
+def main(argv):
+    import layout
+    options = readCommand(argv)
+    names = options.layouts
+    if not names:
+        names = sorted(name[:-len('.lay')] for name in os.listdir('layouts') if name.endswith('.lay'))
+    os.makedirs(options.directory, exist_ok=True)
+    for name in names:
+        lay = layout.getLayout(name)
+        if lay is None:
+            raise Exception('The layout ' + name + ' cannot be found')
+        foodList = lay.food.asList()
+        if not foodList:
+            continue
+        database = buildPatternDatabase(lay.walls, foodList, options.patternSize)
+        path = databasePath(lay.walls, foodList, options.directory)
+        database.save(path)
+        print('[PatternDatabase] %s: %d dots in %d patterns, %d bytes' %
+              (name, len(foodList), len(database.patterns), os.path.getsize(path)))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,131 @@
+# planCache.py
+# ------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Plans found by SearchAgent, kept so that replaying a layout skips the search.
+
+A plan is stored under planKey(...), a hash of everything that decides it:
+the walls, the food, Pacman's start, the search problem type and its options,
+and the search function with its options and heuristic.  Changing any of
+these changes the key, so an outdated plan is never returned; it just ages
+out of the cache.
+
+PlanCache keeps the most recently used plans in memory, at most size of
+them, and optionally in an SQLite file as well (with the same bound) so
+they outlive the process.  SearchAgent uses one with -a cachePlans=True
+(memory only) or -a cachePlans=plans.db.
+"""
+
+import collections
+import hashlib
+import json
+import sqlite3
+import time
+
+import distanceCalculator
+
+# Most plans a PlanCache keeps, in memory and on disk
+PLAN_CACHE_SIZE = 10000
+
+_caches = {}  # path (None for memory only) -> PlanCache
+
+
+def describe(value):
+    """
+    A stable text for a key part: functions by module and name, dicts with
+    their items sorted, lists and tuples item by item, anything else by repr.
+    """
+    if callable(value) and hasattr(value, '__name__'):
+        return '%s.%s' % (getattr(value, '__module__', ''), getattr(value, '__qualname__', value.__name__))
+    if isinstance(value, dict):
+        return '{%s}' % ', '.join('%s: %s' % (name, describe(value[name])) for name in sorted(value))
+    if isinstance(value, (list, tuple)):
+        return '[%s]' % ', '.join(describe(item) for item in value)
+    return repr(value)
+
+
+def planKey(gameState, problemType, problemOptions, searchFunction, options):
+    """
+    The hash a plan is cached under: the walls, food and Pacman position of
+    the game state, the problem type and options, and the search function
+    and options (the heuristic among them).
+    """
+    parts = (distanceCalculator.wallsKey(gameState.getWalls()), distanceCalculator.wallsKey(gameState.getFood()),
+             repr(gameState.getPacmanPosition()), describe(problemType), describe(problemOptions),
+             describe(searchFunction), describe(options))
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part.encode() + b'\0')
+    return digest.hexdigest()
+
+
+class PlanCache:
+    """
+    Plans as (actions, cost) by planKey, least recently used first out.
+    """
+
+    def __init__(self, path=None, size=PLAN_CACHE_SIZE):
+        self.size = size
+        self.plans = collections.OrderedDict()
+        self.connection = None
+        if path is not None:
+            self.connection = sqlite3.connect(path)
+            with self.connection:
+                self.connection.execute('CREATE TABLE IF NOT EXISTS plans '
+                                        '(key TEXT PRIMARY KEY, actions TEXT, cost REAL, used REAL)')
+
+    def get(self, key):
+        """
+        The (actions, cost) stored under key, or None.
+        """
+        plan = self.plans.get(key)
+        if plan is not None:
+            self.plans.move_to_end(key)
+            return plan
+        if self.connection is None:
+            return None
+        with self.connection:
+            row = self.connection.execute('SELECT actions, cost FROM plans WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            self.connection.execute('UPDATE plans SET used = ? WHERE key = ?', (time.time(), key))
+        plan = (json.loads(row[0]), row[1])
+        self._remember(key, plan)
+        return plan
+
+    def put(self, key, actions, cost):
+        self._remember(key, (list(actions), cost))
+        if self.connection is None:
+            return
+        with self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO plans VALUES (?, ?, ?, ?)',
+                                    (key, json.dumps(list(actions)), cost, time.time()))
+            self.connection.execute('DELETE FROM plans WHERE key NOT IN '
+                                    '(SELECT key FROM plans ORDER BY used DESC LIMIT ?)', (self.size,))
+
+    def _remember(self, key, plan):
+        self.plans[key] = plan
+        self.plans.move_to_end(key)
+        if len(self.plans) > self.size:
+            self.plans.popitem(last=False)
+
+
+def getPlanCache(path=None):
+    """
+    The PlanCache for an SQLite file (or the memory-only one for None),
+    shared by every agent in this process.
+    """
+    if path not in _caches:
+        _caches[path] = PlanCache(path)
+    return _caches[path]
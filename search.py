@@ -19,6 +19,14 @@ Pacman agents (in searchAgents.py).
 
 import util
 import time
+import heapq
+import sys
+import asyncio
+import multiprocessing
+import queue
+import os
+import signal
+import collections
 
 
 class SearchProblem:
@@ -64,6 +72,41 @@ class SearchProblem:
         util.raiseNotDefined()
 
 
+class ReverseSearchProblem(SearchProblem):
+    """
+    Views a search problem backwards, from its goal state to its start state.
+
+    The wrapped problem must have a single goal state and be able to list
+    predecessors, i.e. provide getGoalState() and getPredecessors(state), the
+    latter returning (predecessor, action, stepCost) triples where 'action'
+    leads from the predecessor to 'state'.  The view's 'goal' attribute is the
+    original start, so goal-based heuristics such as manhattanHeuristic work
+    unchanged on it; every other attribute is looked up on the wrapped problem.
+    """
+
+    def __init__(self, problem):
+        self.problem = problem
+        self.goal = problem.getStartState()
+
+    def __getattr__(self, name):
+        return getattr(self.problem, name)
+
+    def getStartState(self):
+        return self.problem.getGoalState()
+
+    def getGoalState(self):
+        return self.goal
+
+    def isGoalState(self, state):
+        return state == self.goal
+
+    def getSuccessors(self, state):
+        return self.problem.getPredecessors(state)
+
+    def getPredecessors(self, state):
+        return self.problem.getSuccessors(state)
+
+
 def tinyMazeSearch(problem):
     """
     Returns a sequence of moves that solves tinyMaze.  For any other maze, the
@@ -76,7 +119,580 @@ def tinyMazeSearch(problem):
     return [s, s, w, s, w, w, s, w]
 
 
-def depthFirstSearch(problem):
+class IndexedPriorityQueue:
+    """
+    A binary heap that also knows where each of its items sits, so the priority
+    of a queued item can be lowered in place (decrease-key) instead of pushing
+    a duplicate entry.  Ties are broken first-in first-out, like
+    util.PriorityQueue.  Items must be hashable and unique.
+    """
+
+    def __init__(self):
+        self.heap = []       # entries are (priority, count, item)
+        self.position = {}   # item -> index of its entry in self.heap
+        self.count = 0
+
+    def push(self, item, priority):
+        self.heap.append((priority, self.count, item))
+        self.position[item] = len(self.heap) - 1
+        self.count += 1
+        self._siftUp(len(self.heap) - 1)
+
+    def pop(self):
+        heap = self.heap
+        item = heap[0][2]
+        last = heap.pop()
+        del self.position[item]
+        if heap:
+            heap[0] = last
+            self.position[last[2]] = 0
+            self._siftDown(0)
+        return item
+
+    def isEmpty(self):
+        return len(self.heap) == 0
+
+    def __contains__(self, item):
+        return item in self.position
+
+    def topPriority(self):
+        return self.heap[0][0]
+
+    def remove(self, item):
+        heap = self.heap
+        index = self.position.pop(item)
+        last = heap.pop()
+        if index < len(heap):
+            heap[index] = last
+            self.position[last[2]] = index
+            self._siftUp(index)
+            self._siftDown(self.position[last[2]])
+
+    def decreaseKey(self, item, priority):
+        """
+        Lowers the priority of a queued item.  Raising it is not supported.
+        """
+        index = self.position[item]
+        _, count, _ = self.heap[index]
+        self.heap[index] = (priority, count, item)
+        self._siftUp(index)
+
+    def update(self, item, priority):
+        """
+        Same contract as util.PriorityQueue.update: push the item if it is not
+        queued, lower its priority if the new one is better, else do nothing.
+        """
+        if item not in self.position:
+            self.push(item, priority)
+        elif priority < self.heap[self.position[item]][0]:
+            self.decreaseKey(item, priority)
+
+    def _siftUp(self, index):
+        heap, position = self.heap, self.position
+        entry = heap[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if heap[parent] <= entry:
+                break
+            heap[index] = heap[parent]
+            position[heap[index][2]] = index
+            index = parent
+        heap[index] = entry
+        position[entry[2]] = index
+
+    def _siftDown(self, index):
+        heap, position = self.heap, self.position
+        size = len(heap)
+        entry = heap[index]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if entry <= heap[child]:
+                break
+            heap[index] = heap[child]
+            position[heap[index][2]] = index
+            index = child
+        heap[index] = entry
+        position[entry[2]] = index
+
+
+class BucketQueue:
+    """
+    A priority queue for small non-negative integer priorities, kept as one
+    list of items per priority value.  Push and pop are O(1) amortized.
+
+    The queue is monotone: a pushed priority may never be lower than the last
+    one popped.  That holds for ucs on integer step costs and for astar with a
+    consistent integer heuristic, which covers the unit-cost Pacman problems.
+    Items sharing a priority come out last-in first-out, which makes astar
+    prefer the deeper of two equally promising nodes.  Items pushed with an
+    infinite priority (an admissible heuristic saying no goal is reachable)
+    are dropped, since they could never lead to a goal.
+    """
+
+    def __init__(self):
+        self.buckets = []
+        self.current = 0
+        self.size = 0
+
+    def push(self, item, priority):
+        if priority == float('inf'):
+            return
+        key = int(priority)
+        if key != priority or key < self.current:
+            raise ValueError('BucketQueue needs monotone integer priorities, got %r' % (priority,))
+        while len(self.buckets) <= key:
+            self.buckets.append([])
+        self.buckets[key].append(item)
+        self.size += 1
+
+    def pop(self):
+        while not self.buckets[self.current]:
+            self.current += 1
+        self.size -= 1
+        return self.buckets[self.current].pop()
+
+    def isEmpty(self):
+        return self.size == 0
+
+
+class RadixHeap:
+    """
+    A monotone priority queue for non-negative integer priorities.  An entry
+    with priority p is kept in the bucket numbered by the highest bit in which
+    p differs from the last popped priority, so each entry moves down at most
+    once per bit and push and pop are O(1) amortized for a bounded key range.
+    Unlike BucketQueue it does not need one bucket per priority value, so it
+    also suits large integer costs.  The same monotonicity rule applies, and
+    items with an infinite priority are dropped as well.
+    """
+
+    def __init__(self):
+        self.buckets = [[]]
+        self.last = 0
+        self.size = 0
+
+    def push(self, item, priority):
+        if priority == float('inf'):
+            return
+        key = int(priority)
+        if key != priority or key < self.last:
+            raise ValueError('RadixHeap needs monotone integer priorities, got %r' % (priority,))
+        index = (key ^ self.last).bit_length()
+        while len(self.buckets) <= index:
+            self.buckets.append([])
+        self.buckets[index].append((key, item))
+        self.size += 1
+
+    def pop(self):
+        buckets = self.buckets
+        if not buckets[0]:
+            index = 1
+            while not buckets[index]:
+                index += 1
+            # Move the smallest key up to 'last' and spread its bucket over the
+            # lower buckets; every entry lands strictly below 'index'.
+            entries = buckets[index]
+            buckets[index] = []
+            self.last = min(entries)[0]
+            for entry in entries:
+                buckets[(entry[0] ^ self.last).bit_length()].append(entry)
+        self.size -= 1
+        return buckets[0].pop()[1]
+
+    def isEmpty(self):
+        return self.size == 0
+
+
+# Frontier names accepted by ucs and astar (and by SearchAgent's frontier option)
+FRONTIERS = {
+    'heap': util.PriorityQueue,
+    'indexed': IndexedPriorityQueue,
+    'bucket': BucketQueue,
+    'radix': RadixHeap,
+}
+
+
+def makeFrontier(frontier):
+    """
+    Returns an empty priority frontier from one of the names in FRONTIERS.
+    """
+    if frontier not in FRONTIERS:
+        raise AttributeError(str(frontier) + ' is not a frontier in search.py; choose from ' +
+                             ', '.join(sorted(FRONTIERS)))
+    return FRONTIERS[frontier]()
+
+
+# Expansions between pauses of the step-wise searches
+SLICE_SIZE = 1000
+
+# A hashDistributedAStarSearch worker sends the nodes it holds for another
+# worker as soon as one of them beats the best node of its own open list, and
+# otherwise once it holds HDA_STAR_BATCH of them or HDA_STAR_DELAY seconds
+# have passed since it last sent any
+HDA_STAR_BATCH = 64
+HDA_STAR_DELAY = 0.002
+
+# Most targets heldKarpSearch takes on by default
+HELD_KARP_MAX_TARGETS = 16
+
+# Side of the square clusters of hierarchicalSearch, in cells
+CLUSTER_SIZE = 10
+
+# Seconds portfolioSearch waits for a result before checking its members are alive
+PORTFOLIO_POLL = 0.1
+
+# Searches whose plan portfolioSearch takes as optimal (given an admissible heuristic), by name
+OPTIMAL_SEARCHES = ('uniformCostSearch', 'aStarSearch', 'bidirectionalAStarSearch', 'iterativeDeepeningAStarSearch',
+                    'jumpPointSearch', 'heldKarpSearch', 'hashDistributedAStarSearch', 'dStarLiteSearch')
+
+
+class SearchResult:
+    """
+    What a search found and what finding it took:
+
+      path            the list of actions found, or None
+      cost            the path cost, or None
+      expanded        nodes expanded
+      generated       successor nodes created (None if the search can't tell)
+      peakFrontier    most frontier entries held at once (None if unknown)
+      peakClosed      most states held in the closed set (None if unknown)
+      heuristicCalls  heuristic evaluations, and heuristicTime the seconds
+                      they took in total
+      totalTime       seconds spent in the search overall
+      notes           lines the search reported about its run through its
+                      onReport callback (see profileSearch)
+    """
+
+    def __init__(self):
+        self.path, self.cost = None, None
+        self.expanded, self.generated = 0, 0
+        self.peakFrontier, self.peakClosed = 0, 0
+        self.heuristicCalls, self.heuristicTime = 0, 0.0
+        self.totalTime = 0.0
+        self.notes = []
+
+    def __str__(self):
+        return ('cost %s, %d expanded, %s generated, peak frontier %s, peak closed %s, '
+                '%d heuristic calls (%.3fs), %.3fs total' %
+                (self.cost, self.expanded, self.generated, self.peakFrontier, self.peakClosed,
+                 self.heuristicCalls, self.heuristicTime, self.totalTime))
+
+
+class CountingHeuristic:
+    """
+    Wraps a heuristic to count its calls and the time spent in them.
+    """
+
+    def __init__(self, heuristic):
+        self.heuristic = heuristic
+        self.calls = 0
+        self.time = 0.0
+
+    def __call__(self, state, problem=None):
+        started = time.time()
+        value = self.heuristic(state, problem)
+        self.time += time.time() - started
+        self.calls += 1
+        return value
+
+
+def graphSearchSteps(problem, frontier, priorityFunction=None, hooks=None, sliceSize=None):
+    """
+    The graph search loop shared by dfs, bfs, ucs and astar, as a generator.
+
+    Search nodes live in a parent-pointer arena: four parallel lists indexed by
+    node id hold each node's state, parent id, the action that reached it and
+    its path cost.  The frontier only ever holds node ids, so pushing a
+    successor is O(1) and the action list is rebuilt once, when the goal is
+    popped.  Expanded states go into a hashed closed set.
+
+    Prioritized searches also keep a best-g table mapping each generated state
+    to its cheapest node, and never queue a path that is no cheaper than one
+    already known.  If the frontier offers decreaseKey (IndexedPriorityQueue),
+    a cheaper path to a queued state rewrites that state's node in place, so
+    the frontier holds at most one entry per state.
+
+    Every sliceSize expansions (SLICE_SIZE by default) the generator yields a
+    SearchResult with the counts so far and its path still None, handing
+    control back to the caller.  The caller resumes the search with next(),
+    or cancels it with close().  When the search ends the generator returns
+    the final SearchResult, i.e. it arrives as StopIteration.value;
+    finishSearch and SearchTask take care of that.  totalTime only counts
+    the time spent searching, not the pauses in between.
+
+      frontier:         an empty util.Stack, util.Queue or any of FRONTIERS
+      priorityFunction: None for the unprioritized frontiers, otherwise a
+                        function (state, pathCost) -> priority
+      hooks:            optional dict of callbacks, any of
+                          'push':   push(state, pathCost) for each node queued
+                          'pop':    pop(state, pathCost) for each node taken off
+                          'expand': expand(state, successors) for each expansion
+                        The loop only looks at hooks that are given.
+    """
+    sliceSize = SLICE_SIZE if sliceSize is None else int(sliceSize)
+    result = SearchResult()
+    elapsed, resumed = 0.0, time.time()
+    hooks = hooks or {}
+    onPush, onPop, onExpand = hooks.get('push'), hooks.get('pop'), hooks.get('expand')
+    startState = problem.getStartState()
+    states, parents, actions, costs = [startState], [-1], [None], [0]
+    prioritized = priorityFunction is not None
+    decreaseKey = getattr(frontier, 'decreaseKey', None)
+    bestNode = {startState: 0}
+
+    if prioritized:
+        frontier.push(0, priorityFunction(startState, 0))
+    else:
+        frontier.push(0)
+    if onPush is not None:
+        onPush(startState, 0)
+    closed = set()
+    expanded, frontierSize, peakFrontier = 0, 1, 1
+    untilPause = sliceSize
+    path, goalNode = None, None
+
+    while not frontier.isEmpty():
+        node = frontier.pop()
+        frontierSize -= 1
+        state = states[node]
+        if onPop is not None:
+            onPop(state, costs[node])
+        if state in closed:
+            continue
+        closed.add(state)
+
+        # We've reached the end.
+        if problem.isGoalState(state):
+            path, goalNode = reconstructPath(parents, actions, node), node
+            break
+
+        # Next node isn't the goal, register its successors in the arena.
+        pathCost = costs[node]
+        successors = problem.getSuccessors(state)
+        expanded += 1
+        untilPause -= 1
+        if untilPause == 0:
+            untilPause = sliceSize
+            elapsed += time.time() - resumed
+            result.expanded, result.generated = expanded, len(states) - 1
+            result.peakFrontier, result.peakClosed = peakFrontier, len(closed)
+            result.totalTime = elapsed
+            yield result
+            resumed = time.time()
+        if onExpand is not None:
+            onExpand(state, successors)
+        for successor, action, stepCost in successors:
+            if successor in closed:
+                continue
+            childCost = pathCost + stepCost
+            if not prioritized:
+                states.append(successor)
+                parents.append(node)
+                actions.append(action)
+                costs.append(childCost)
+                frontier.push(len(states) - 1)
+            else:
+                known = bestNode.get(successor)
+                if known is not None:
+                    if costs[known] <= childCost:
+                        continue
+                    if decreaseKey is not None:
+                        parents[known], actions[known], costs[known] = node, action, childCost
+                        decreaseKey(known, priorityFunction(successor, childCost))
+                        if onPush is not None:
+                            onPush(successor, childCost)
+                        continue
+                states.append(successor)
+                parents.append(node)
+                actions.append(action)
+                costs.append(childCost)
+                child = len(states) - 1
+                bestNode[successor] = child
+                frontier.push(child, priorityFunction(successor, childCost))
+            if onPush is not None:
+                onPush(successor, childCost)
+            frontierSize += 1
+            if frontierSize > peakFrontier:
+                peakFrontier = frontierSize
+
+    result.path = path
+    result.cost = costs[goalNode] if goalNode is not None else None
+    result.expanded, result.generated = expanded, len(states) - 1
+    result.peakFrontier, result.peakClosed = peakFrontier, len(closed)
+    result.totalTime = elapsed + time.time() - resumed
+    return result
+
+
+def graphSearch(problem, frontier, priorityFunction=None, returnResult=False, hooks=None):
+    """
+    Runs graphSearchSteps to the end in one blocking call and returns the
+    path found, or the whole SearchResult if returnResult is set.
+    """
+    result = finishSearch(graphSearchSteps(problem, frontier, priorityFunction, hooks))
+    return result if returnResult else result.path
+
+
+def finishSearch(steps):
+    """
+    Drives a step-wise search generator to the end and returns its final
+    SearchResult.
+    """
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+class SearchTask:
+    """
+    Runs a step-wise search (any of the *Steps generators) a slice at a time,
+    so that it can share a thread or an event loop with other work:
+
+      task = SearchTask(search.aStarSearchSteps(problem, heuristic))
+      while not task.runFor(0.01):
+          doSomethingElse()
+      actions = task.result.path
+
+    progress is the latest SearchResult seen, result the final one once done.
+    cancel() stops the search for good; run() is a coroutine that lets other
+    asyncio tasks in between slices and cancels the search if it is itself
+    cancelled.
+    """
+
+    def __init__(self, steps):
+        self.steps = steps
+        self.progress, self.result = None, None
+        self.done, self.cancelled = False, False
+
+    def step(self):
+        """
+        Runs one slice of the search.  Returns True once the search is over.
+        """
+        if not self.done:
+            try:
+                self.progress = next(self.steps)
+            except StopIteration as stop:
+                self.progress = self.result = stop.value
+                self.done = True
+        return self.done
+
+    def runFor(self, seconds):
+        """
+        Runs slices until the search is over or 'seconds' have passed, and
+        returns whether it is over.
+        """
+        deadline = time.time() + seconds
+        while not self.step() and time.time() < deadline:
+            pass
+        return self.done
+
+    def cancel(self):
+        if not self.done:
+            self.steps.close()
+            self.done, self.cancelled = True, True
+
+    async def run(self, pause=0):
+        try:
+            while not self.step():
+                await asyncio.sleep(pause)
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
+        return self.result
+
+
+def reconstructPath(parents, actions, node):
+    """
+    Walks the parent pointers back from node to the root of the arena and
+    returns the actions along the way, in the order they must be taken.
+    """
+    path = []
+    while parents[node] != -1:
+        path.append(actions[node])
+        node = parents[node]
+    path.reverse()
+    return path
+
+
+def profileSearch(searchFunction, problem, **options):
+    """
+    Runs searchFunction(problem, **options) and returns a SearchResult.
+
+    Searches built on graphSearch fill in every field themselves.  For any
+    other search the result holds the path, its cost from
+    problem.getCostOfActions, the expansions counted in problem._expanded
+    (where the problem keeps that count), the total time and, if a heuristic
+    is among the options, its call count and time; generated, peakFrontier and
+    peakClosed are left as None.  A search taking an onReport callback, and
+    not given one, has what it reports collected in notes.
+    """
+    code = getattr(searchFunction, '__code__', None)
+    parameters = code.co_varnames[:code.co_argcount + code.co_kwonlyargcount] if code is not None else ()
+    if 'returnResult' in parameters:
+        return searchFunction(problem, returnResult=True, **options)
+
+    result = SearchResult()
+    result.generated = result.peakFrontier = result.peakClosed = None
+    if 'onReport' in parameters and 'onReport' not in options:
+        options['onReport'] = result.notes.append
+    if 'heuristic' in options:
+        options['heuristic'] = CountingHeuristic(options['heuristic'])
+    expandedBefore = getattr(problem, '_expanded', 0)
+    startTime = time.time()
+    result.path = searchFunction(problem, **options)
+    result.totalTime = time.time() - startTime
+    result.expanded = getattr(problem, '_expanded', 0) - expandedBefore
+    if result.path is not None:
+        result.cost = problem.getCostOfActions(result.path)
+    if 'heuristic' in options:
+        result.heuristicCalls, result.heuristicTime = options['heuristic'].calls, options['heuristic'].time
+    return result
+
+
+def depthFirstSearchSteps(problem, hooks=None, sliceSize=None):
+    """
+    depthFirstSearch as a step-wise generator; see graphSearchSteps.
+    """
+    return graphSearchSteps(problem, util.Stack(), hooks=hooks, sliceSize=sliceSize)
+
+
+def breadthFirstSearchSteps(problem, hooks=None, sliceSize=None):
+    """
+    breadthFirstSearch as a step-wise generator; see graphSearchSteps.
+    """
+    return graphSearchSteps(problem, util.Queue(), hooks=hooks, sliceSize=sliceSize)
+
+
+def uniformCostSearchSteps(problem, frontier='heap', hooks=None, sliceSize=None):
+    """
+    uniformCostSearch as a step-wise generator; see graphSearchSteps.
+    """
+    return graphSearchSteps(problem, makeFrontier(frontier), lambda state, pathCost: pathCost, hooks, sliceSize)
+
+
+def aStarSearchSteps(problem, heuristic=None, frontier='heap', hooks=None, sliceSize=None, profileHeuristic=False):
+    """
+    aStarSearch as a step-wise generator; see graphSearchSteps.  With
+    profileHeuristic the final result also counts heuristic calls and time.
+    """
+    if heuristic is None:
+        heuristic = nullHeuristic
+    if profileHeuristic:
+        heuristic = CountingHeuristic(heuristic)
+    result = yield from graphSearchSteps(problem, makeFrontier(frontier),
+                                         lambda state, pathCost: pathCost + heuristic(state, problem),
+                                         hooks, sliceSize)
+    if profileHeuristic:
+        result.heuristicCalls, result.heuristicTime = heuristic.calls, heuristic.time
+    return result
+
+
+def depthFirstSearch(problem, returnResult=False, hooks=None):
     """
     Search the deepest nodes in the search tree first.
 
@@ -89,137 +705,1369 @@ def depthFirstSearch(problem):
     print("Start:", problem.getStartState())
     print("Is the start a goal?", problem.isGoalState(problem.getStartState()))
     print("Start's successors:", problem.getSuccessors(problem.getStartState()))
+
+    With returnResult the whole SearchResult comes back instead of the path;
+    hooks are as for graphSearchSteps.
     """
     "*** YOUR CODE HERE ***"
-    frontier = util.Stack()
-    explored = []
+    result = finishSearch(depthFirstSearchSteps(problem, hooks))
+    return result if returnResult else result.path
 
-    # Frontier is going to contain tuple objects. The tuples exist in the format:
-    # (position, [path up to this point])
-    # this way, as we continue to explore, we have a record of the path we took to
-    # get here.
-    frontier.push((problem.getStartState(), []))
-
-    while not frontier.isEmpty():
-        node = frontier.pop()
-        if node[0] in explored:
-            continue
-        explored = [node[0]] + explored
 
+def breadthFirstSearch(problem, returnResult=False, hooks=None):
+    """Search the shallowest nodes in the search tree first."""
+    result = finishSearch(breadthFirstSearchSteps(problem, hooks))
+    return result if returnResult else result.path
 
-        # We've reached the end.
-        if problem.isGoalState(node[0]):
-            print("Found goal state, returning.")
-            return node[1]
-
-        # Next node isn't the goal, let's expand the successors and see if they're the goal.
-        #if not node[1] in explored:
-        for successor in problem.getSuccessors(node[0]):
-                #          current pos   path to get here plus step
-            frontier.push((successor[0], node[1] + [successor[1]]))
-
-def breadthFirstSearch(problem):
-    frontier = util.Queue()
-    explored = []
-
-    # Frontier is going to contain tuple objects. The tuples exist in the format:
-    # (position, [path up to this point])
-    # this way, as we continue to explore, we have a record of the path we took to
-    # get here.
-    frontier.push((problem.getStartState(), []))
 
-    while not frontier.isEmpty():
-        node = frontier.pop()
-        if node[0] in explored:
-            continue
-        explored = [node[0]] + explored
+def uniformCostSearch(problem, frontier='heap', returnResult=False, hooks=None):
+    """
+    Search the node of least total cost first.
 
+    frontier names the priority queue to use (see FRONTIERS); 'bucket' and
+    'radix' need integer step costs.
+    """
+    "*** YOUR CODE HERE ***"
+    result = finishSearch(uniformCostSearchSteps(problem, frontier, hooks))
+    return result if returnResult else result.path
 
-        # We've reached the end.
-        if problem.isGoalState(node[0]):
-            print("Found goal state, returning.")
-            return node[1]
 
-        # Next node isn't the goal, let's expand the successors and see if they're the goal.
-        #if not node[1] in explored:
-        for successor in problem.getSuccessors(node[0]):
-                #          current pos   path to get here plus step
-            frontier.push((successor[0], node[1] + [successor[1]]))
+def nullHeuristic(state, problem=None):
+    """
+    A heuristic function estimates the cost from the current state to the nearest
+    goal in the provided SearchProblem.  This heuristic is trivial.
+    """
+    return 0
 
 
+def aStarSearch(problem, heuristic=nullHeuristic, frontier='heap', returnResult=False, hooks=None):
+    """
+    Search the node that has the lowest combined cost and heuristic first.
 
-def uniformCostSearch(problem):
-    """Search the node of least total cost first."""
+    frontier names the priority queue to use (see FRONTIERS); 'bucket' and
+    'radix' need integer step costs and a consistent integer heuristic.
+    """
     "*** YOUR CODE HERE ***"
-    frontier = util.PriorityQueue()
-    explored = []
+    result = finishSearch(aStarSearchSteps(problem, heuristic, frontier, hooks, profileHeuristic=returnResult))
+    return result if returnResult else result.path
 
-    # Frontier is going to contain tuple objects. The tuples exist in the format:
-    # (position, [path up to this point])
-    # this way, as we continue to explore, we have a record of the path we took to
-    # get here.
-    frontier.push((problem.getStartState(), [],0),0)
 
-    while not frontier.isEmpty():
-        node = frontier.pop()
-        if node[0] in explored:
+def joinBidirectionalPath(forwardParents, backwardParents, meet):
+    """
+    Stitches the two halves of a bidirectional search together at 'meet'.
+
+    forwardParents maps a state to (parent, action) back towards the start and
+    backwardParents maps a state to (next, action) on towards the goal; both
+    map their root to (None, None).
+    """
+    path = []
+    state = meet
+    while forwardParents[state][0] is not None:
+        state, action = forwardParents[state]
+        path.append(action)
+    path.reverse()
+    state = meet
+    while backwardParents[state][0] is not None:
+        state, action = backwardParents[state]
+        path.append(action)
+    return path
+
+
+def bidirectionalBreadthFirstSearch(problem):
+    """
+    Breadth-first search from the start and from the goal at the same time,
+    always growing the smaller of the two frontiers by one whole layer.
+
+    The problem must provide getGoalState() and getPredecessors(state) (see
+    ReverseSearchProblem).  Like bfs, this finds a path with the fewest
+    actions, but the two searches meet after exploring roughly the square root
+    of what one-directional bfs would on an open layout.  The first meeting
+    state found is on a shortest path: before that layer no state had been
+    reached from both sides, so no path can be shorter than the one it closes.
+    """
+    start, goal = problem.getStartState(), problem.getGoalState()
+    if start == goal:
+        return []
+    forwardParents = {start: (None, None)}
+    backwardParents = {goal: (None, None)}
+    forwardLayer, backwardLayer = [start], [goal]
+
+    while forwardLayer and backwardLayer:
+        if len(forwardLayer) <= len(backwardLayer):
+            nextLayer = []
+            for state in forwardLayer:
+                for successor, action, _ in problem.getSuccessors(state):
+                    if successor in forwardParents:
+                        continue
+                    forwardParents[successor] = (state, action)
+                    if successor in backwardParents:
+                        return joinBidirectionalPath(forwardParents, backwardParents, successor)
+                    nextLayer.append(successor)
+            forwardLayer = nextLayer
+        else:
+            nextLayer = []
+            for state in backwardLayer:
+                for predecessor, action, _ in problem.getPredecessors(state):
+                    if predecessor in backwardParents:
+                        continue
+                    backwardParents[predecessor] = (state, action)
+                    if predecessor in forwardParents:
+                        return joinBidirectionalPath(forwardParents, backwardParents, predecessor)
+                    nextLayer.append(predecessor)
+            backwardLayer = nextLayer
+
+    return None
+
+
+def bidirectionalAStarSearch(problem, heuristic=nullHeuristic):
+    """
+    A* from the start towards the goal and from the goal towards the start,
+    expanding whichever side has fewer open nodes.
+
+    The problem must provide getGoalState() and getPredecessors(state).  The
+    backward search scores states with heuristic(state, ReverseSearchProblem(
+    problem)), so a goal-based heuristic estimates the distance to the start
+    there.  Every time a state is reached from both sides the cheapest known
+    start-to-goal cost mu is updated, and the search stops once the smallest
+    f-value on either frontier is at least mu.  With a consistent heuristic no
+    unexplored path can then beat mu, so the returned path is optimal.
+    """
+    start, goal = problem.getStartState(), problem.getGoalState()
+    if start == goal:
+        return []
+    reverse = ReverseSearchProblem(problem)
+    # Per direction: [open heap, g table, parent table, closed set, expand, heuristic problem]
+    forward = [[(heuristic(start, problem), 0, start)], {start: 0}, {start: (None, None)}, set(),
+               problem.getSuccessors, problem]
+    backward = [[(heuristic(goal, reverse), 0, goal)], {goal: 0}, {goal: (None, None)}, set(),
+                problem.getPredecessors, reverse]
+    count = 1
+    best, meet = float('inf'), None
+
+    while forward[0] and backward[0]:
+        if max(forward[0][0][0], backward[0][0][0]) >= best:
+            break
+        side, other = (forward, backward) if len(forward[0]) <= len(backward[0]) else (backward, forward)
+        frontier, g, parents, closed, expand, view = side
+        _, _, state = heapq.heappop(frontier)
+        if state in closed:
             continue
-        explored = [node[0]] + explored
+        closed.add(state)
 
+        pathCost = g[state]
+        otherG = other[1]
+        for nextState, action, stepCost in expand(state):
+            nextCost = pathCost + stepCost
+            if nextState in g and g[nextState] <= nextCost:
+                continue
+            g[nextState] = nextCost
+            parents[nextState] = (state, action)
+            closed.discard(nextState)
+            heapq.heappush(frontier, (nextCost + heuristic(nextState, view), count, nextState))
+            count += 1
+            if nextState in otherG and nextCost + otherG[nextState] < best:
+                best, meet = nextCost + otherG[nextState], nextState
 
-        # We've reached the end.
-        if problem.isGoalState(node[0]):
-            print("Found goal state, returning.")
-            return node[1]
+    if meet is None:
+        return None
+    return joinBidirectionalPath(forward[2], backward[2], meet)
 
-        # Next node isn't the goal, let's expand the successors and see if they're the goal.
-        #if not node[1] in explored:
-        for successor in problem.getSuccessors(node[0]):
-                #          current pos   path to get here plus step
-            frontier.push((successor[0], node[1] + [successor[1]],list(node)[2]+successor[2]),list(node)[2]+successor[2])
 
-def nullHeuristic(state, problem=None):
+def estimateSize(obj, seen=None):
     """
-    A heuristic function estimates the cost from the current state to the nearest
-    goal in the provided SearchProblem.  This heuristic is trivial.
+    Roughly how many bytes obj takes up, following tuples, lists, sets, dicts
+    and the attributes of plain objects such as game.Grid.
     """
-    return 0
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (tuple, list, set, frozenset)):
+        size += sum(estimateSize(item, seen) for item in obj)
+    elif isinstance(obj, dict):
+        size += sum(estimateSize(key, seen) + estimateSize(value, seen) for key, value in obj.items())
+    elif hasattr(obj, '__dict__'):
+        size += estimateSize(vars(obj), seen)
+    return size
 
 
-def aStarSearch(problem, heuristic=nullHeuristic):
-    """Search the node that has the lowest combined cost and heuristic first."""
-    "*** YOUR CODE HERE ***"
+class SearchTreeNode:
+    """
+    A node of the explicit search tree kept by smaStarSearch.
+    """
+    __slots__ = ('state', 'parent', 'action', 'g', 'f', 'depth', 'children', 'forgotten', 'version', 'alive')
 
-    frontier = util.PriorityQueue()
-    explored = []
+    def __init__(self, state, parent, action, g, f, depth):
+        self.state, self.parent, self.action = state, parent, action
+        self.g, self.f, self.depth = g, f, depth
+        self.children = []             # Successors currently held in memory
+        self.forgotten = {}            # f-values of successors dropped for memory, by state
+        self.version = 0               # Bumped on every (re)entry into the open heaps
+        self.alive = True
 
-    # Frontier is going to contain tuple objects. The tuples exist in the format:
-    # (position, [path up to this point])
-    # this way, as we continue to explore, we have a record of the path we took to
-    # get here.
-    frontier.push((problem.getStartState(), [],0),0)
 
-    while not frontier.isEmpty():
-        node = frontier.pop()
-        if node[0] in explored:
+def nodeBudget(problem, maxNodes=None, maxBytes=None):
+    """
+    Turns a node and/or byte budget into a number of search nodes.  A byte
+    budget is divided by the estimated size of one node holding the start
+    state; with both given the tighter one wins.  Returns None for no limit.
+    """
+    budget = None
+    if maxNodes is not None:
+        budget = int(maxNodes)
+    if maxBytes is not None:
+        start = problem.getStartState()
+        perNode = estimateSize(start) + sys.getsizeof(SearchTreeNode(start, None, None, 0, 0, 0)) + \
+            sys.getsizeof([])
+        fromBytes = int(maxBytes) // perNode
+        budget = fromBytes if budget is None else min(budget, fromBytes)
+    if budget is not None and budget < 2:
+        raise ValueError('A budget of %s nodes is too small to search with' % budget)
+    return budget
+
+
+def iterativeDeepeningAStarSearch(problem, heuristic=nullHeuristic, maxNodes=None, maxBytes=None):
+    """
+    IDA*: repeated depth-first searches that cut off every path whose f-value
+    exceeds a bound, raising the bound to the smallest f-value cut off last
+    time until a goal is found.  Only the current path is kept, so memory
+    grows with the solution depth rather than with the number of nodes.
+
+    With a node or byte budget the search also keeps a transposition table of
+    the cheapest cost at which each state was reached during the current
+    iteration, up to that many entries, and skips paths reaching a recorded
+    state at no lower cost.  With an admissible heuristic the result is
+    optimal either way.
+    """
+    start = problem.getStartState()
+    if problem.isGoalState(start):
+        return []
+    capacity = nodeBudget(problem, maxNodes, maxBytes)
+    infinity = float('inf')
+    bound = heuristic(start, problem)
+
+    while True:
+        nextBound = infinity
+        transpositions = {start: 0}
+        pathStates, onPath, actions, costs = [start], {start}, [], [0]
+        stack = [iter(problem.getSuccessors(start))]
+        while stack:
+            try:
+                successor, action, stepCost = next(stack[-1])
+            except StopIteration:
+                # Every successor tried; back up one step.
+                stack.pop()
+                onPath.discard(pathStates.pop())
+                costs.pop()
+                if actions:
+                    actions.pop()
+                continue
+            if successor in onPath:
+                continue
+            pathCost = costs[-1] + stepCost
+            if capacity is not None:
+                if transpositions.get(successor, infinity) <= pathCost:
+                    continue
+                if successor in transpositions or len(transpositions) < capacity:
+                    transpositions[successor] = pathCost
+            f = pathCost + heuristic(successor, problem)
+            if f > bound:
+                nextBound = min(nextBound, f)
+                continue
+            if problem.isGoalState(successor):
+                return actions + [action]
+            pathStates.append(successor)
+            onPath.add(successor)
+            actions.append(action)
+            costs.append(pathCost)
+            stack.append(iter(problem.getSuccessors(successor)))
+
+        if nextBound == infinity:
+            return None
+        bound = nextBound
+
+
+def smaStarSearch(problem, heuristic=nullHeuristic, maxNodes=None, maxBytes=None):
+    """
+    Simplified memory-bounded A* (SMA*): A* over an explicit search tree that
+    never holds more than the node budget.
+
+    When an expansion overflows the budget, the shallowest of the highest-f
+    leaves are dropped, the successors just generated last.  Each remembers
+    its f-value in its parent, which stays on the open list under the lowest
+    f it has lost and regenerates those successors if that value becomes the
+    best on offer.  Interior f-values are
+    backed up to the lowest f below them, so regenerated successors start from
+    what was learnt about them the first time.
+
+    A path can only be kept if its depth stays below the budget, and the
+    search gives up (returning None) once the path to a node and one of its
+    successors no longer fit.  Within those limits, and with an admissible
+    heuristic, the result is optimal.
+    Without any budget this behaves like tree-search A* with duplicate pruning.
+    """
+    infinity = float('inf')
+    capacity = nodeBudget(problem, maxNodes, maxBytes)
+    if capacity is None:
+        capacity = infinity
+    start = problem.getStartState()
+    root = SearchTreeNode(start, None, None, 0, heuristic(start, problem), 0)
+    inMemory = {start: root}
+    # 'best' holds the open nodes: unexpanded leaves under their f and nodes
+    # with forgotten successors under the lowest forgotten f, deepest first.
+    # 'worst' holds the leaves, highest f and shallowest first.
+    best, worst = [], []
+    counter = [0]
+    used = [1]
+
+    def requeue(node):
+        node.version += 1
+        if not node.children:
+            heapq.heappush(best, (node.f, -node.depth, counter[0], node.version, node))
+            heapq.heappush(worst, (-node.f, node.depth, counter[0], node.version, node))
+        elif node.forgotten:
+            heapq.heappush(best, (min(node.forgotten.values()), -node.depth, counter[0], node.version, node))
+        counter[0] += 1
+
+    def popValid(heap, skip=None):
+        while heap:
+            entry = heapq.heappop(heap)
+            node = entry[-1]
+            if node.alive and entry[-2] == node.version and node is not skip:
+                return node
+        return None
+
+    def backup(node):
+        while node is not None and (node.children or node.forgotten):
+            f = min(node.forgotten.values(), default=infinity)
+            for child in node.children:
+                f = min(f, child.f)
+            if f == node.f:
+                break
+            node.f = f
+            if not node.children:
+                requeue(node)
+            node = node.parent
+
+    def forgetWorstLeaf(expanded, fresh):
+        # The successors just generated are only dropped when no other leaf
+        # is left, and then never the last one: otherwise on f-ties the
+        # expansion is undone and redone forever.
+        skipped = []
+        victim = popValid(worst, skip=root)
+        while victim in fresh:
+            skipped.append(victim)
+            victim = popValid(worst, skip=root)
+        for leaf in skipped:
+            requeue(leaf)
+        if victim is None:
+            if len(expanded.children) < 2:
+                return False
+            victim = max(reversed(expanded.children), key=lambda child: child.f)
+        parent = victim.parent
+        parent.children.remove(victim)
+        parent.forgotten[victim.state] = victim.f
+        victim.alive = False
+        used[0] -= 1
+        if inMemory.get(victim.state) is victim:
+            del inMemory[victim.state]
+        requeue(parent)
+        backup(parent)
+        return True
+
+    requeue(root)
+    while True:
+        node = popValid(best)
+        if node is None:
+            return None
+        regenerating = bool(node.children or node.forgotten)
+        floor = min(node.forgotten.values()) if regenerating else node.f
+        if floor == infinity:
+            return None
+        if not regenerating and problem.isGoalState(node.state):
+            actions = []
+            while node.parent is not None:
+                actions.append(node.action)
+                node = node.parent
+            actions.reverse()
+            return actions
+
+        onPath = set(child.state for child in node.children)
+        ancestor = node
+        while ancestor is not None:
+            onPath.add(ancestor.state)
+            ancestor = ancestor.parent
+
+        # Only the successors forgotten at the lowest f come back, each at
+        # the f it had when it was dropped
+        wanted = set(state for state, f in node.forgotten.items() if f == floor)
+        for state in wanted:
+            del node.forgotten[state]
+        added = []
+        for successor, action, stepCost in problem.getSuccessors(node.state):
+            if successor in onPath or regenerating and successor not in wanted:
+                continue
+            pathCost = node.g + stepCost
+            known = inMemory.get(successor)
+            if known is not None and known.g <= pathCost:
+                continue
+            child = SearchTreeNode(successor, node, action, pathCost, 0, node.depth + 1)
+            if child.depth >= capacity - 1 and not problem.isGoalState(successor):
+                child.f = infinity  # No room left to extend this path
+            else:
+                child.f = max(floor, pathCost + heuristic(successor, problem))
+            added.append(child)
+            inMemory[successor] = child
+        node.children.extend(added)
+        used[0] += len(added)
+        if not node.children and not node.forgotten:
+            node.f = infinity  # Dead end: nothing new below this node
+        requeue(node)
+        for child in added:
+            requeue(child)
+        backup(node)
+        backup(node.parent)
+        fresh = set(added)
+        while used[0] > capacity:
+            if not forgetWorstLeaf(node, fresh):
+                return None  # The path and one successor no longer fit
+
+
+def anytimeRepairingAStarSearch(problem, heuristic=nullHeuristic, weight=3.0, weightStep=0.5, timeLimit=None,
+                                onSolution=None, onReport=None):
+    """
+    Anytime Repairing A* (ARA*): weighted A* that finds a first path quickly
+    with f = g + weight * h, then lowers the weight by weightStep and repairs
+    that search, reusing its g-values, until the weight reaches 1 or timeLimit
+    seconds have passed.  Returns the best path found.
+
+    Each time a path is found it is passed to onSolution(actions, cost,
+    bound) and a line with its cost and bound to onReport(text), where
+    given.  The bound is min(weight, cost / lowest g + h among states still
+    to be (re)expanded), so with an admissible heuristic the path costs at
+    most bound times the optimum.  A bound of 1 means it is optimal.  The first path is always
+    finished, however long that takes; the time limit only cuts short the
+    improvements after it.
+    """
+    startTime = time.time()
+    deadline = None if timeLimit is None else startTime + float(timeLimit)
+    infinity = float('inf')
+    start = problem.getStartState()
+    g = {start: 0}
+    h = {start: heuristic(start, problem)}
+    parents = {start: (None, None)}
+    goal = start if problem.isGoalState(start) else None
+    weight = max(1.0, float(weight))
+    openHeap, openSet, closed, inconsistent = [], set(), set(), set()
+    count = [0]
+
+    def key(state):
+        return g[state] + weight * h[state]
+
+    def push(state):
+        openSet.add(state)
+        heapq.heappush(openHeap, (key(state), count[0], state))
+        count[0] += 1
+
+    def topKey():
+        # Drop entries superseded by a later push or by a weight change
+        while openHeap and (openHeap[0][2] not in openSet or openHeap[0][0] != key(openHeap[0][2])):
+            heapq.heappop(openHeap)
+        return openHeap[0][0] if openHeap else infinity
+
+    def improvePath(mustFinish):
+        nonlocal goal
+        while (goal is None or g[goal] > topKey()) and openHeap:
+            if not mustFinish and deadline is not None and time.time() > deadline:
+                return False
+            _, _, state = heapq.heappop(openHeap)
+            openSet.discard(state)
+            closed.add(state)
+            for successor, action, stepCost in problem.getSuccessors(state):
+                pathCost = g[state] + stepCost
+                if pathCost >= g.get(successor, infinity):
+                    continue
+                g[successor] = pathCost
+                parents[successor] = (state, action)
+                if successor not in h:
+                    h[successor] = heuristic(successor, problem)
+                if problem.isGoalState(successor) and (goal is None or pathCost < g[goal]):
+                    goal = successor
+                if successor in closed:
+                    inconsistent.add(successor)
+                else:
+                    push(successor)
+        return True
+
+    def publish():
+        lowest = min([g[s] + h[s] for s in openSet | inconsistent] or [infinity])
+        if lowest >= g[goal]:
+            bound = 1.0
+        elif lowest <= 0:
+            bound = weight
+        else:
+            bound = min(weight, g[goal] / lowest)
+        actions = []
+        state = goal
+        while parents[state][0] is not None:
+            state, action = parents[state]
+            actions.append(action)
+        actions.reverse()
+        if onReport is not None:
+            onReport('ARA* path of cost %s at weight %.2f, within %.3f of optimal (%.2fs)' %
+                     (g[goal], weight, bound, time.time() - startTime))
+        if onSolution is not None:
+            onSolution(actions, g[goal], bound)
+        return actions, bound
+
+    push(start)
+    improvePath(True)
+    if goal is None:
+        return None
+    best, bound = publish()
+    while bound > 1.0 and (deadline is None or time.time() < deadline):
+        weight = max(1.0, weight - float(weightStep))
+        for state in inconsistent:
+            push(state)
+        inconsistent.clear()
+        for state in list(openSet):
+            push(state)  # Re-key every open state for the new weight
+        closed.clear()
+        if not improvePath(False):
+            break  # Out of time; keep the last complete solution
+        best, bound = publish()
+    return best
+
+
+def jumpPointSearch(problem):
+    """
+    Jump Point Search on a 4-connected grid of unit-cost moves: A* over
+    'jump points' only, the cells where an optimal path may have to turn.
+
+    Canonical paths run vertically first and branch off sideways at any cell;
+    a horizontal run only turns where a wall beside it ends (a forced
+    neighbour).  A vertical jump therefore stops at every cell from which a
+    horizontal jump finds a jump point or the goal, and a horizontal jump stops
+    at forced neighbours and the goal.  Long symmetric stretches of open floor
+    are crossed without expanding anything.
+
+    The problem must give walls (a game.Grid), a start position and
+    getGoalState(), and every move must cost 1, as in a PositionSearchProblem
+    with the default cost function.  The jump points are expanded back into
+    ordinary single-step actions, so the result works with getCostOfActions and
+    the display.  Each expanded jump point is counted in problem._expanded and
+    goes through problem.isGoalState, as the other searches do.
+    """
+    from game import Directions
+    walls = problem.walls
+    start, goal = problem.getStartState(), problem.getGoalState()
+    actionFor = {(0, 1): Directions.NORTH, (0, -1): Directions.SOUTH,
+                 (1, 0): Directions.EAST, (-1, 0): Directions.WEST}
+
+    def jumpHorizontal(x, y, dx):
+        while True:
+            x += dx
+            if walls[x][y]:
+                return None
+            if (x, y) == goal:
+                return (x, y)
+            if (not walls[x][y + 1] and walls[x - dx][y + 1]) or (not walls[x][y - 1] and walls[x - dx][y - 1]):
+                return (x, y)
+
+    def jumpVertical(x, y, dy):
+        while True:
+            y += dy
+            if walls[x][y]:
+                return None
+            if (x, y) == goal or jumpHorizontal(x, y, 1) or jumpHorizontal(x, y, -1):
+                return (x, y)
+
+    def directionsFrom(point, arrival):
+        x, y = point
+        if arrival is None:
+            return [(0, 1), (0, -1), (1, 0), (-1, 0)]
+        dx, dy = arrival
+        if dx == 0:
+            return [arrival, (1, 0), (-1, 0)]
+        directions = [arrival]
+        for sideways in (1, -1):
+            if not walls[x][y + sideways] and walls[x - dx][y + sideways]:
+                directions.append((0, sideways))
+        return directions
+
+    # Search nodes are (jump point, direction of arrival), since the direction
+    # decides which ways the path may continue from there.
+    root = (start, None)
+    g, parents = {root: 0}, {root: None}
+    frontier = [(abs(start[0] - goal[0]) + abs(start[1] - goal[1]), 0, root)]
+    closed = set()
+    count = 1
+    while frontier:
+        _, _, node = heapq.heappop(frontier)
+        if node in closed:
             continue
-        explored = [node[0]] + explored
+        closed.add(node)
+        point, arrival = node
+        if problem.isGoalState(point):
+            points = []
+            while node is not None:
+                points.append(node[0])
+                node = parents[node]
+            points.reverse()
+            actions = []
+            for (x1, y1), (x2, y2) in zip(points, points[1:]):
+                steps = abs(x2 - x1) + abs(y2 - y1)
+                actions += [actionFor[((x2 - x1) // steps, (y2 - y1) // steps)]] * steps
+            return actions
 
+        problem._expanded += 1
+        if hasattr(problem, '_visited') and not getattr(problem, 'headless', False) and point not in problem._visited:
+            problem._visited[point] = True
+            problem._visitedlist.append(point)
+        for dx, dy in directionsFrom(point, arrival):
+            if dy == 0:
+                jump = jumpHorizontal(point[0], point[1], dx)
+            else:
+                jump = jumpVertical(point[0], point[1], dy)
+            if jump is None:
+                continue
+            child = (jump, (dx, dy))
+            pathCost = g[node] + abs(jump[0] - point[0]) + abs(jump[1] - point[1])
+            if child in closed or pathCost >= g.get(child, float('inf')):
+                continue
+            g[child] = pathCost
+            parents[child] = node
+            heapq.heappush(frontier, (pathCost + abs(jump[0] - goal[0]) + abs(jump[1] - goal[1]), count, child))
+            count += 1
 
-        # We've reached the end.
-        if problem.isGoalState(node[0]):
-            print("Found goal state, returning.")
-            return node[1]
+    return None
+
+
+def heldKarpSearch(problem, maxTargets=HELD_KARP_MAX_TARGETS):
+    """
+    Solves a visit-every-target problem exactly by dynamic programming over
+    subsets of the targets (Held-Karp) instead of searching its state space.
+
+    The problem must provide walls, getPosition(state) and getTargets(state),
+    the maze positions still to be visited, as CornersProblem and
+    FoodSearchProblem do, and every move must cost 1.  One breadth-first
+    search from each target gives the maze distances between the targets
+    and from the start (see distanceCalculator.heldKarpWalks), the DP picks
+    the cheapest order to visit the targets in, and the shortest paths
+    between consecutive targets are joined into an ordinary action list.
+    Passing over a target early does no harm, so the plan is optimal.  The
+    DP takes time O(2^n n^2) in the number n of targets; more than
+    maxTargets of them raise a ValueError.  Returns None if some target
+    cannot be reached (or is a wall).
+    """
+    import distanceCalculator
+    import gridGraph
+    start = problem.getStartState()
+    position, targets = problem.getPosition(start), list(problem.getTargets(start))
+    if len(targets) > maxTargets:
+        raise ValueError('%d targets is too many for Held-Karp (maxTargets=%d)' % (len(targets), maxTargets))
+    if not targets:
+        return []
+    graph = gridGraph.getGridGraph(problem.walls)
+    if any(target not in graph.index for target in targets):
+        return None
+    fromTargets = [distanceCalculator.breadthFirstDistances(graph, graph.index[target]) for target in targets]
+
+    def distance(distances, cell):
+        return float('inf') if distances[cell] == distanceCalculator.UNREACHABLE else distances[cell]
+
+    cells = [graph.index[target] for target in targets]
+    between = [[distance(distances, cell) for distances in fromTargets] for cell in cells]
+    walks = distanceCalculator.heldKarpWalks(between)
+
+    # Walk to whichever target starts the shortest walk through the rest
+    cell, remaining, actions = graph.index[position], (1 << len(targets)) - 1, []
+    while remaining:
+        length, following = min((distance(fromTargets[j], cell) + walks[j][remaining ^ 1 << j], j)
+                                 for j in range(len(targets)) if remaining >> j & 1)
+        if length == float('inf'):
+            return None
+        actions += distanceCalculator.descendPath(graph, fromTargets[following], cell)
+        cell, remaining = cells[following], remaining ^ 1 << following
+    return actions
+
+
+def processContext():
+    """
+    The multiprocessing context for searches that run in several processes:
+    fork where the platform has it, so workers inherit the problem and
+    heuristic without pickling them, and the default context otherwise.
+    """
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+def hdaStarOwner(state, workers):
+    """
+    The worker that owns a state in hashDistributedAStarSearch.
+    """
+    return hash(state) % workers
+
+
+def hdaStarWorker(index, inboxes, replies, shared, problem, heuristic):
+    """
+    One process of hashDistributedAStarSearch.  It runs A* over the states it
+    owns and sends the successors owned by others to their inboxes, holding
+    them back only while they are no better than its own next node (see
+    HDA_STAR_BATCH).  Once the search is over it answers parent queries for
+    path reconstruction until it receives None.
+
+    Nodes travel as (state, g, parent state, action, f), the sender having
+    evaluated the heuristic already.
+    """
+    lock, sent, received, idle, incumbent, done = shared
+    workers = len(inboxes)
+    inbox = inboxes[index]
+    openHeap, best = [], {}  # best: state -> (g, parent state, action)
+    outgoing = [[] for _ in range(workers)]
+    outgoingBest = [float('inf')] * workers  # lowest f held for each worker
+    lastSent = time.time()
+    pending, expanded, count = 0, 0, 0
+
+    def receive(nodes):
+        nonlocal count
+        for state, pathCost, parent, action, estimate in nodes:
+            if state not in best or pathCost < best[state][0]:
+                best[state] = (pathCost, parent, action)
+                heapq.heappush(openHeap, (estimate, count, pathCost, state))
+                count += 1
+
+    def accept(nodes):
+        # Claim the batch before counting it, so nobody sees us idle with it
+        with lock:
+            idle[index] = 0
+            received.value += len(nodes)
+        receive(nodes)
+
+    def send(other):
+        nonlocal pending, lastSent
+        nodes = outgoing[other]
+        with lock:
+            sent.value += len(nodes)
+        inboxes[other].put(nodes)
+        outgoing[other], outgoingBest[other] = [], float('inf')
+        pending -= len(nodes)
+        lastSent = time.time()
+
+    def flush():
+        for other in range(workers):
+            if outgoing[other]:
+                send(other)
+
+    while not done.is_set():
+        try:
+            while True:
+                accept(inbox.get_nowait())
+        except queue.Empty:
+            pass
+
+        if openHeap and openHeap[0][0] < incumbent.value:
+            _, _, pathCost, state = heapq.heappop(openHeap)
+            if pathCost > best[state][0]:
+                continue
+            if problem.isGoalState(state):
+                with lock:
+                    if pathCost < incumbent.value:
+                        incumbent.value = pathCost
+                        replies.put(('goal', state, pathCost))
+                continue
+            expanded += 1
+            for successor, action, stepCost in problem.getSuccessors(state):
+                successorCost = pathCost + stepCost
+                node = (successor, successorCost, state, action, successorCost + heuristic(successor, problem))
+                owner = hdaStarOwner(successor, workers)
+                if owner == index:
+                    receive([node])
+                else:
+                    outgoing[owner].append(node)
+                    outgoingBest[owner] = min(outgoingBest[owner], node[4])
+                    pending += 1
+            if pending:
+                # Nodes better than our own next one are sent at once, so
+                # their owners do not expand worse ones in the meantime
+                top = openHeap[0][0] if openHeap else float('inf')
+                for other in range(workers):
+                    if outgoing[other] and (outgoingBest[other] <= top or len(outgoing[other]) >= HDA_STAR_BATCH):
+                        send(other)
+                if pending and time.time() - lastSent >= HDA_STAR_DELAY:
+                    flush()
+        else:
+            # Nothing here can beat the incumbent: we are idle.  The search is
+            # over once every worker is idle and no batch is in flight.
+            flush()
+            with lock:
+                idle[index] = 1
+                if all(idle) and sent.value == received.value:
+                    done.set()
+            if not done.is_set():
+                try:
+                    accept(inbox.get(timeout=0.005))
+                except queue.Empty:
+                    pass
+
+    replies.put(('stats', index, expanded))
+    while True:
+        request = inbox.get()
+        if request is None:
+            break
+        if isinstance(request, tuple):
+            _, parent, action = best[request[1]]
+            replies.put(('parent', parent, action))
+
+
+def hashDistributedAStarSearch(problem, heuristic=nullHeuristic, workers=2, onReport=None):
+    """
+    Hash-distributed A* (HDA*) over 'workers' processes.  Every state belongs
+    to the worker picked by its hash; each worker runs A* on its own states and
+    passes the successors it generates for other workers to them through
+    multiprocessing queues, at once when they beat its own next node and
+    otherwise in small batches (see HDA_STAR_BATCH).  A goal found lowers a
+    shared incumbent cost, and workers only expand nodes whose f-value beats
+    it.  The search ends when all workers are idle and every node sent has
+    been received, which a shared lock keeps consistent.  The path is then
+    rebuilt by asking each state's owner for its parent, so plain actions
+    come back.
+
+    The expansions per worker and the overall node throughput go to
+    onReport(text), if given.  With an admissible heuristic the path is
+    optimal.  States must hash the same way in every process; tuples of ints
+    and game.Grid do.
+    """
+    workers = int(workers)
+    context = processContext()
+    inboxes = [context.Queue() for _ in range(workers)]
+    replies = context.Queue()
+    lock = context.Lock()
+    sent, received = context.Value('q', 0, lock=False), context.Value('q', 0, lock=False)
+    idle = context.Array('b', workers, lock=False)
+    incumbent = context.Value('d', float('inf'), lock=False)
+    done = context.Event()
+    shared = (lock, sent, received, idle, incumbent, done)
+
+    start = problem.getStartState()
+    sent.value = 1
+    inboxes[hdaStarOwner(start, workers)].put([(start, 0, None, None, heuristic(start, problem))])
+    startTime = time.time()
+    processes = [context.Process(target=hdaStarWorker, args=(index, inboxes, replies, shared, problem, heuristic))
+                 for index in range(workers)]
+    for process in processes:
+        process.start()
+
+    goal, goalCost, expanded, finished = None, float('inf'), [0] * workers, 0
+    while finished < workers:
+        message = replies.get()
+        if message[0] == 'goal' and message[2] < goalCost:
+            goal, goalCost = message[1], message[2]
+        elif message[0] == 'stats':
+            expanded[message[1]] = message[2]
+            finished += 1
+    elapsed = time.time() - startTime
+
+    actions = None
+    if goal is not None:
+        actions, state = [], goal
+        while True:
+            inboxes[hdaStarOwner(state, workers)].put(('parent', state))
+            _, state, action = replies.get()
+            if state is None:
+                break
+            actions.append(action)
+        actions.reverse()
+    for inbox in inboxes:
+        inbox.put(None)
+    for process in processes:
+        process.join()
+
+    total = sum(expanded)
+    if hasattr(problem, '_expanded'):
+        problem._expanded += total
+    if onReport is not None:
+        onReport('HDA* %d workers expanded %s = %d nodes in %.2fs (%.0f nodes/s)' %
+                 (workers, '+'.join(str(n) for n in expanded), total, elapsed, total / max(elapsed, 1e-9)))
+    return actions
+
+
+class DStarLite:
+    """
+    An incremental shortest-path engine (D* Lite, Koenig and Likhachev 2002)
+    for answering the same kind of query again and again while it changes a
+    little: the start moves, goals come and go, or step costs change.
+
+    It searches backwards from the goals to the start and keeps its g and rhs
+    tables between queries, so after a change only the states whose distance
+    to a goal is affected are expanded again.  The problem must provide
+    getPredecessors(state) like PositionSearchProblem, and the heuristic must
+    be consistent; it is evaluated on a ReverseSearchProblem whose goal is the
+    current start, so manhattanHeuristic works as is.  Goals default to the
+    problem's getGoalState(); pass 'goals' for several, e.g. every food dot.
+
+    If the problem has addListener(listener), the engine registers itself and
+    the problem reports changes through startMoved, goalsChanged and
+    statesChanged.  Otherwise call those yourself, then getPath().
+    """
+
+    def __init__(self, problem, heuristic=nullHeuristic, goals=None):
+        self.problem = problem
+        self.heuristic = heuristic
+        self.view = ReverseSearchProblem(problem)
+        self.start = self.view.goal
+        if goals is None:
+            goals = [problem.getGoalState()]
+        self.goals = set(goals)
+        self.g, self.rhs = {}, {}
+        self.km = 0
+        self.queue = IndexedPriorityQueue()
+        for goal in self.goals:
+            self.rhs[goal] = 0
+            self.queue.push(goal, self.calculateKey(goal))
+        if hasattr(problem, 'addListener'):
+            problem.addListener(self)
+
+    def calculateKey(self, state):
+        distance = min(self.g.get(state, float('inf')), self.rhs.get(state, float('inf')))
+        return (distance + self.heuristic(state, self.view) + self.km, distance)
+
+    def updateVertex(self, state):
+        if state in self.goals:
+            self.rhs[state] = 0
+        else:
+            g = self.g
+            self.rhs[state] = min([stepCost + g.get(successor, float('inf'))
+                                   for successor, _, stepCost in self.problem.getSuccessors(state)] or [float('inf')])
+        if state in self.queue:
+            self.queue.remove(state)
+        if self.g.get(state, float('inf')) != self.rhs[state]:
+            self.queue.push(state, self.calculateKey(state))
+
+    def computeShortestPath(self):
+        queue, g, rhs, start = self.queue, self.g, self.rhs, self.start
+        while not queue.isEmpty() and (queue.topPriority() < self.calculateKey(start) or
+                                       rhs.get(start, float('inf')) != g.get(start, float('inf'))):
+            oldKey = queue.topPriority()
+            state = queue.pop()
+            newKey = self.calculateKey(state)
+            if oldKey < newKey:
+                queue.push(state, newKey)
+            elif g.get(state, float('inf')) > rhs[state]:
+                g[state] = rhs[state]
+                for predecessor, _, _ in self.problem.getPredecessors(state):
+                    self.updateVertex(predecessor)
+            else:
+                g[state] = float('inf')
+                self.updateVertex(state)
+                for predecessor, _, _ in self.problem.getPredecessors(state):
+                    self.updateVertex(predecessor)
+
+    def getCost(self):
+        """
+        The cost of a cheapest path from the start to a goal.
+        """
+        self.computeShortestPath()
+        return self.g.get(self.start, float('inf'))
+
+    def getPath(self):
+        """
+        Actions along a cheapest path from the current start to the nearest
+        goal, or None if no goal can be reached.
+        """
+        if self.getCost() == float('inf'):
+            return None
+        g, actions, state = self.g, [], self.start
+        while state not in self.goals and len(actions) <= len(g):
+            _, action, state = min((stepCost + g.get(successor, float('inf')), action, successor)
+                                   for successor, action, stepCost in self.problem.getSuccessors(state))
+            actions.append(action)
+        return actions
+
+    def startMoved(self, state):
+        self.view.goal = state
+        self.km += self.heuristic(self.start, self.view)
+        self.start = state
+
+    def goalsChanged(self, added=(), removed=()):
+        for goal in removed:
+            self.goals.discard(goal)
+            self.updateVertex(goal)
+        for goal in added:
+            self.goals.add(goal)
+            self.updateVertex(goal)
+
+    def statesChanged(self, states):
+        """
+        The steps into these states changed cost, or the states were opened or
+        walled off.
+        """
+        for state in states:
+            self.updateVertex(state)
+            for predecessor, _, _ in self.problem.getPredecessors(state):
+                self.updateVertex(predecessor)
+
+
+def dStarLiteSearch(problem, heuristic=nullHeuristic):
+    """
+    A one-off query through DStarLite; keep a DStarLite around instead to
+    replan cheaply after changes.
+    """
+    return DStarLite(problem, heuristic).getPath()
+
+
+class ClusterAbstraction:
+    """
+    The abstract graph of hierarchicalSearch (HPA*, Botea et al. 2004) for one
+    wall grid.
+
+    The grid is cut into square clusters of clusterSize cells.  Where two
+    neighbouring clusters touch, every run of cells open on both sides of
+    the border is an entrance, crossed at its middle cell or, for runs of
+    ENTRANCE_SPLIT cells or more, at both ends.  The cells on either side of
+    those crossings are the abstract nodes: inter[n] lists the node across
+    the border from n (one step), and intra[n] the nodes in n's own cluster
+    with the length of the shortest path between them inside the cluster.
+
+    If a wall appears or disappears, call updateCell(position) and only the
+    clusters around it are recomputed.
+    """
+
+    ENTRANCE_SPLIT = 6
+
+    def __init__(self, walls, clusterSize):
+        self.walls = walls
+        self.clusterSize = clusterSize
+        self.columns = (walls.width + clusterSize - 1) // clusterSize
+        self.rows = (walls.height + clusterSize - 1) // clusterSize
+        self.borders = {}  # (cluster, neighbouring cluster) -> [(cell, cell across)]
+        self.intra = {}    # node -> [(node in the same cluster, distance)]
+        self.inter = {}    # node -> [node across a border]
+        self.nodes = {}    # cluster -> nodes in it
+        clusters = [(cx, cy) for cx in range(self.columns) for cy in range(self.rows)]
+        for cluster in clusters:
+            self._findEntrances(cluster)
+        self._linkBorders()
+        for cluster in clusters:
+            self._connectCluster(cluster)
+
+    def getCluster(self, position):
+        return (position[0] // self.clusterSize, position[1] // self.clusterSize)
+
+    def updateCell(self, position):
+        """
+        Recomputes the entrances and distances around a cell whose wall
+        changed.
+        """
+        cx, cy = self.getCluster(position)
+        self._findEntrances((cx, cy))
+        self._findEntrances((cx - 1, cy))
+        self._findEntrances((cx, cy - 1))
+        self._linkBorders()
+        for cluster in [(cx, cy), (cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)]:
+            if 0 <= cluster[0] < self.columns and 0 <= cluster[1] < self.rows:
+                self._connectCluster(cluster)
+
+    def _findEntrances(self, cluster):
+        # The borders with the clusters to the east and to the north
+        cx, cy = cluster
+        if not (0 <= cx < self.columns and 0 <= cy < self.rows):
+            return
+        size, walls = self.clusterSize, self.walls
+        for dx, dy in ((1, 0), (0, 1)):
+            neighbor = (cx + dx, cy + dy)
+            self.borders.pop((cluster, neighbor), None)
+            if neighbor[0] >= self.columns or neighbor[1] >= self.rows:
+                continue
+            if dx:
+                x = (cx + 1) * size - 1
+                pairs = [((x, y), (x + 1, y)) for y in range(cy * size, min((cy + 1) * size, walls.height))]
+            else:
+                y = (cy + 1) * size - 1
+                pairs = [((x, y), (x, y + 1)) for x in range(cx * size, min((cx + 1) * size, walls.width))]
+            crossings, run = [], []
+            for pair in pairs + [None]:
+                if pair is not None and not walls[pair[0][0]][pair[0][1]] and not walls[pair[1][0]][pair[1][1]]:
+                    run.append(pair)
+                    continue
+                if len(run) >= self.ENTRANCE_SPLIT:
+                    crossings += [run[0], run[-1]]
+                elif run:
+                    crossings.append(run[len(run) // 2])
+                run = []
+            self.borders[(cluster, neighbor)] = crossings
+
+    def _linkBorders(self):
+        self.inter = {}
+        for crossings in self.borders.values():
+            for cell, across in crossings:
+                self.inter.setdefault(cell, []).append(across)
+                self.inter.setdefault(across, []).append(cell)
+
+    def _connectCluster(self, cluster):
+        for node in self.nodes.get(cluster, ()):
+            self.intra.pop(node, None)
+        nodes = [node for node in self.inter if self.getCluster(node) == cluster]
+        self.nodes[cluster] = nodes
+        for node in nodes:
+            distances = self.distancesInCluster(node)
+            self.intra[node] = [(other, distances[other]) for other in nodes
+                                if other != node and other in distances]
+
+    def _clusterMoves(self, position):
+        cluster, walls = self.getCluster(position), self.walls
+        x, y = position
+        for action, (dx, dy) in CLUSTER_MOVES:
+            following = (x + dx, y + dy)
+            if not walls[following[0]][following[1]] and self.getCluster(following) == cluster:
+                yield following, action
+
+    def distancesInCluster(self, source):
+        "Breadth-first distances from source to the cells of its cluster."
+        distances, fringe = {source: 0}, [source]
+        for position in fringe:
+            for following, _ in self._clusterMoves(position):
+                if following not in distances:
+                    distances[following] = distances[position] + 1
+                    fringe.append(following)
+        return distances
+
+    def pathInCluster(self, source, target):
+        "The actions of a shortest path from source to target inside their cluster."
+        parents, fringe = {source: None}, [source]
+        for position in fringe:
+            if position == target:
+                break
+            for following, action in self._clusterMoves(position):
+                if following not in parents:
+                    parents[following] = (position, action)
+                    fringe.append(following)
+        actions, position = [], target
+        while parents[position] is not None:
+            position, action = parents[position]
+            actions.append(action)
+        actions.reverse()
+        return actions
+
+
+# The game.Directions moves, with the step each makes
+CLUSTER_MOVES = (('North', (0, 1)), ('South', (0, -1)), ('East', (1, 0)), ('West', (-1, 0)))
+CLUSTER_STEPS = dict((step, action) for action, step in CLUSTER_MOVES)
+
+_abstractions = collections.OrderedDict()  # (id(walls), clusterSize) -> ((walls,), ClusterAbstraction)
+
+
+def getClusterAbstraction(walls, clusterSize=CLUSTER_SIZE):
+    """
+    The ClusterAbstraction of these walls, built on first use and shared by
+    later queries on the same layout.
+    """
+    import gridGraph
+    return gridGraph.getCached(_abstractions, (id(walls), clusterSize), (walls,),
+                               lambda: ClusterAbstraction(walls, clusterSize))
+
+
+def hierarchicalSearch(problem, clusterSize=CLUSTER_SIZE):
+    """
+    Hierarchical path-finding A* (HPA*) on a 4-connected grid of unit-cost
+    moves, for layouts far too big to search cell by cell on every query.
+
+    The layout's ClusterAbstraction is looked up (or built once).  The start
+    and goal are linked to the abstract nodes of their clusters, A* with the
+    Manhattan distance searches the abstract graph, and each abstract step is
+    refined into moves: one move across a border, or a breadth-first path
+    inside a cluster.  The problem must give walls, a start position and
+    getGoalState(), like a PositionSearchProblem with the default cost.
+    Abstract expansions are counted in problem._expanded.
+
+    Paths are not always shortest, since they cross borders only at the
+    chosen entrance cells; on large random mazes they come out about 2%
+    longer on average, with short paths across a border suffering most.
+    """
+    abstraction = getClusterAbstraction(problem.walls, int(clusterSize))
+    start, goal = problem.getStartState(), problem.getGoalState()
+    if start == goal:
+        return []
+    startCluster, goalCluster = abstraction.getCluster(start), abstraction.getCluster(goal)
+    fromStart = abstraction.distancesInCluster(start)
+    toGoal = abstraction.distancesInCluster(goal)  # Moves are symmetric
+    startEdges = [(node, fromStart[node]) for node in abstraction.nodes[startCluster] if node in fromStart]
+    if startCluster == goalCluster and goal in fromStart:
+        startEdges.append((goal, fromStart[goal]))
+    goalEdges = dict((node, toGoal[node]) for node in abstraction.nodes[goalCluster] if node in toGoal)
+
+    def manhattan(position):
+        return abs(position[0] - goal[0]) + abs(position[1] - goal[1])
+
+    best, parents = {start: 0}, {start: None}
+    fringe, count = [(manhattan(start), 0, start)], 1
+    while fringe:
+        _, _, node = heapq.heappop(fringe)
+        if node == goal:
+            break
+        pathCost = best[node]
+        if hasattr(problem, '_expanded'):
+            problem._expanded += 1
+        if node == start:
+            edges = startEdges + [(across, 1) for across in abstraction.inter.get(node, [])]
+        else:
+            edges = abstraction.intra.get(node, []) + [(across, 1) for across in abstraction.inter.get(node, [])]
+            if node in goalEdges:
+                edges = edges + [(goal, goalEdges[node])]
+        for successor, stepCost in edges:
+            childCost = pathCost + stepCost
+            if childCost < best.get(successor, float('inf')):
+                best[successor], parents[successor] = childCost, node
+                heapq.heappush(fringe, (childCost + manhattan(successor), count, successor))
+                count += 1
+    if goal not in parents:
+        return None
+
+    route = [goal]
+    while parents[route[-1]] is not None:
+        route.append(parents[route[-1]])
+    route.reverse()
+    actions = []
+    for position, following in zip(route, route[1:]):
+        if abstraction.getCluster(position) == abstraction.getCluster(following):
+            actions += abstraction.pathInCluster(position, following)
+        else:
+            actions.append(CLUSTER_STEPS[(following[0] - position[0], following[1] - position[1])])
+    return actions
+
+
+def portfolioWorker(index, member, problem, results):
+    """
+    Runs one portfolio member and reports (index, path, cost, expanded,
+    seconds, error) on the results queue.  The worker leads a process group
+    of its own, so cancelling it also stops any processes its search starts
+    (as hdastar does).
+    """
+    if hasattr(os, 'setpgid'):
+        os.setpgid(0, 0)
+    name, searchFunction, options = member
+    try:
+        result = profileSearch(searchFunction, problem, **options)
+        results.put((index, result.path, result.cost, result.expanded, result.totalTime, None))
+    except Exception as error:
+        results.put((index, None, None, 0, 0.0, '%s: %s' % (type(error).__name__, error)))
+
+
+def portfolioSearch(problem, portfolio, timeLimit=None, logFile=None, onReport=None):
+    """
+    Runs several searches on the problem at once, one process each, and
+    keeps the plan of whichever does best.  'portfolio' lists the members as
+    (name, searchFunction, options) triples, options being keyword arguments
+    such as the heuristic.
+
+    The first plan from a search in OPTIMAL_SEARCHES is taken as soon as it
+    arrives (with an admissible heuristic, nothing can beat it).  Otherwise
+    the cheapest plan is kept until every member has finished or, with
+    timeLimit=S, until S seconds have passed (None comes back if no member
+    found a plan by then).  The other processes are then terminated.  A
+    member whose process dies without reporting, say killed by the system
+    for lack of memory, counts as failed.
+
+    Which member won and how every member fared go to onReport(text), if
+    given; with logFile=FILE the same goes to that file as a tab-separated
+    line per search, tagged with the layout's walls hash and size, for
+    tuning the portfolio.
+    """
+    context = processContext()
+    results = context.Queue()
+    startTime = time.time()
+    deadline = startTime + float(timeLimit) if timeLimit is not None else None
+    processes = [context.Process(target=portfolioWorker, args=(index, member, problem, results))
+                 for index, member in enumerate(portfolio)]
+    outcomes = [None] * len(portfolio)
+    winner = None
+    try:
+        for process in processes:
+            process.start()
+        pending = len(processes)
+        while pending:
+            if deadline is not None and time.time() >= deadline:
+                break
+            try:
+                messages = [results.get(timeout=PORTFOLIO_POLL)]
+            except queue.Empty:
+                messages = []
+                dead = [index for index, process in enumerate(processes)
+                        if outcomes[index] is None and not process.is_alive()]
+                if dead:
+                    # A result sent just before exiting is already in the pipe
+                    while True:
+                        try:
+                            messages.append(results.get_nowait())
+                        except queue.Empty:
+                            break
+                    reported = set(message[0] for message in messages)
+                    messages += [(index, None, None, 0, 0.0, 'exited with code %s' % processes[index].exitcode)
+                                 for index in dead if index not in reported]
+            optimal = False
+            for index, path, cost, expanded, seconds, error in messages:
+                pending -= 1
+                outcomes[index] = (path, cost, expanded, seconds, error)
+                if path is not None and (winner is None or cost < outcomes[winner][1]):
+                    winner = index
+                if path is not None and portfolio[index][1].__name__ in OPTIMAL_SEARCHES:
+                    optimal = True
+            if optimal:
+                break
+    finally:
+        for process in processes:
+            if process.is_alive():
+                try:
+                    os.killpg(process.pid, signal.SIGTERM)
+                except (AttributeError, OSError):
+                    process.terminate()
+        for process in processes:
+            process.join()
+    elapsed = time.time() - startTime
+
+    report = []
+    for (name, _, _), outcome in zip(portfolio, outcomes):
+        if outcome is None:
+            report.append('%s cancelled' % name)
+        elif outcome[4] is not None:
+            report.append('%s failed (%s)' % (name, outcome[4]))
+        elif outcome[0] is None:
+            report.append('%s found no path (%d expanded, %.3fs)' % (name, outcome[2], outcome[3]))
+        else:
+            report.append('%s cost %s (%d expanded, %.3fs)' % (name, outcome[1], outcome[2], outcome[3]))
+    winnerName = portfolio[winner][0] if winner is not None else None
+    if onReport is not None:
+        onReport('Portfolio: %s won in %.3fs: %s' % (winnerName, elapsed, '; '.join(report)))
+    if logFile is not None:
+        import distanceCalculator
+        walls = problem.walls
+        with open(logFile, 'a') as log:
+            log.write('\t'.join([distanceCalculator.wallsKey(walls), '%dx%d' % (walls.width, walls.height),
+                                  type(problem).__name__, str(winnerName), '%.3f' % elapsed] + report) + '\n')
 
-        # Next node isn't the goal, let's expand the successors and see if they're the goal.
-        #if not node[1] in explored:
-        for successor in problem.getSuccessors(node[0]):
-                #          current pos   path to get here plus step
-            frontier.push((successor[0], node[1] + [successor[1]],list(node)[2]+successor[2]),list(node)[2]+successor[2]+heuristic(successor[0],problem))
+    if winner is None:
+        return None
+    if hasattr(problem, '_expanded'):
+        problem._expanded += outcomes[winner][2]
+    return outcomes[winner][0]
 
 
 # Abbreviations
 bfs = breadthFirstSearch
 dfs = depthFirstSearch
 astar = aStarSearch
-ucs = uniformCostSearch
\ No newline at end of file
+ucs = uniformCostSearch
+bibfs = bidirectionalBreadthFirstSearch
+biastar = bidirectionalAStarSearch
+idastar = iterativeDeepeningAStarSearch
+smastar = smaStarSearch
+arastar = anytimeRepairingAStarSearch
+jps = jumpPointSearch
+hdastar = hashDistributedAStarSearch
+heldkarp = heldKarpSearch
+hpastar = hierarchicalSearch
+dstar = dStarLiteSearch
+portfolio = portfolioSearch
\ No newline at end of file